@@ -1,9 +1,14 @@
 import streamlit as st
 import os
-import json
-from utils.form_recognizer import extract_student_profile_from_pdf
-from utils.smart_matcher import find_best_matches
-from utils.suggestion_generator import generate_suggestions
+import time
+import functools
+from utils.async_pipeline import ResumePipelineRunner
+from utils.suggestion_generator import stream_suggestions, generate_match_suggestions
+from utils.smart_matcher import rank_candidates, rank_matches, matched_opportunities
+from utils import resources, tracing
+from utils.store import SkillStore, SKILLCONNECT_DB_PATH, import_json_tree
+from utils.entity_extractor import normalize_keywords
+from utils.match_store import MatchStore
 
 if "show_opportunities" not in st.session_state:
     st.session_state.show_opportunities = False
@@ -15,8 +20,30 @@ if "matches" not in st.session_state:
     st.session_state.matches = []
 if "suggestions" not in st.session_state:
     st.session_state.suggestions = ""
+if "match_suggestions" not in st.session_state:
+    st.session_state.match_suggestions = None
+if "top_opportunities" not in st.session_state:
+    st.session_state.top_opportunities = []
+if "matches_revision" not in st.session_state:
+    st.session_state.matches_revision = None
+if "pending_resume" not in st.session_state:
+    st.session_state.pending_resume = None
+if "last_trace" not in st.session_state:
+    st.session_state.last_trace = None
+if "browse_pages" not in st.session_state:
+    st.session_state.browse_pages = [None]
+if "browse_filters" not in st.session_state:
+    st.session_state.browse_filters = None
+if "opened_opportunities" not in st.session_state:
+    st.session_state.opened_opportunities = set()
 
 st.set_page_config(page_title="SkillConnect", page_icon="🤖", layout="wide")
+
+@st.cache_resource
+def start_resource_warmup():
+    return resources.warmup(background=True)
+
+start_resource_warmup()
 st.markdown("""
     <style>
     html, body, [class*="css"] {
@@ -102,33 +129,118 @@ st.sidebar.markdown("""
 
 resume_storage_dir = "data/resumes"
 os.makedirs(resume_storage_dir, exist_ok=True)
-resumes_json_dir = "data/json/resumes"
-os.makedirs(resumes_json_dir, exist_ok=True)
-opportunity_dir = "data/json/opportunities"
-os.makedirs(opportunity_dir, exist_ok=True)
+legacy_json_dir = "data/json"
+match_execution_mode = os.getenv("MATCH_EXECUTION_MODE", "serial")
+match_threshold = float(os.getenv("MATCH_THRESHOLD", "0.60"))
+browse_page_size = int(os.getenv("BROWSE_PAGE_SIZE", "10"))
+
+@st.cache_resource
+def get_store(path: str) -> SkillStore:
+    store = SkillStore(path)
+    import_json_tree(store, legacy_json_dir)
+    return store
+
+@st.cache_resource
+def get_pipeline_runner() -> ResumePipelineRunner:
+    return ResumePipelineRunner()
+
+@st.cache_resource
+def get_match_store(path: str) -> MatchStore:
+    return MatchStore(get_store(path))
+
+store = get_store(SKILLCONNECT_DB_PATH)
+opportunity_repo = store.opportunities
+profile_repo = store.profiles
+match_store = get_match_store(SKILLCONNECT_DB_PATH)
+pipeline_runner = get_pipeline_runner()
+
+def wait_for_pipeline(future):
+    status = st.empty()
+    started = time.time()
+    while not future.done():
+        status.caption(f"⏳ Still working on your resume... {time.time() - started:.0f}s")
+        time.sleep(0.25)
+    status.empty()
+    return future.result()
+
+def set_matches(matches, top_opportunities):
+    ranking = [(m["file"], m["score"]) for m in matches]
+    if ranking != [(m["file"], m["score"]) for m in st.session_state.matches]:
+        st.session_state.suggestions = None
+        st.session_state.match_suggestions = None
+    st.session_state.matches = matches
+    st.session_state.top_opportunities = top_opportunities
+
+def refresh_matches(profile_key: str):
+    revision = opportunity_repo.revision()
+    if revision == st.session_state.matches_revision:
+        return
+    stored_profile = profile_repo.get(profile_key)
+    if stored_profile is not None:
+        opportunities = opportunity_repo.load()
+        scores = match_store.score_profile(profile_key, stored_profile, opportunities, match_threshold)
+        matches = rank_matches(scores, match_threshold)
+        set_matches(matches, matched_opportunities(matches, opportunities))
+    st.session_state.matches_revision = revision
 
 if st.sidebar.button("🔍 Explore Internships/Projects"):
     st.session_state.show_opportunities = not st.session_state.show_opportunities
 
+def show_opportunity_details(opp: dict):
+    st.write(f"**Duration:** {opp.get('duration')}")
+    st.write(f"**Role:** {opp.get('role', 'Not specified')}")
+    st.write(f"**Skills:** {', '.join(opp.get('required_skills', []))}")
+    st.write(f"**Description:** {opp.get('description')}")
+    if opp.get("faculty"):
+        st.write(f"**Faculty / Contact Person:** {opp.get('faculty')}")
+    if opp.get("mandatory_certifications"):
+        certs = ', '.join(opp["mandatory_certifications"])
+        st.write(f"**Mandatory Courses / Certifications:** {certs}")
+    if opp.get("stipend"):
+        st.write(f"**Stipend / Compensation:** {opp.get('stipend')}")
+
 if st.session_state.show_opportunities:
-    if os.listdir(opportunity_dir):
-        for opp_file in os.listdir(opportunity_dir):
-            with open(os.path.join(opportunity_dir, opp_file)) as f:
-                opp = json.load(f)
-            with st.sidebar.expander(opp.get("title", "Untitled Opportunity")):
-                st.write(f"**Organization:** {opp.get('organization')}")
-                st.write(f"**Duration:** {opp.get('duration')}")
-                st.write(f"**Type:** {opp.get('type')}")
-                st.write(f"**Role:** {opp.get('role', 'Not specified')}")
-                st.write(f"**Skills:** {', '.join(opp.get('required_skills', []))}")
-                st.write(f"**Description:** {opp.get('description')}")
-                if opp.get("faculty"):
-                    st.write(f"**Faculty / Contact Person:** {opp.get('faculty')}")
-                if opp.get("mandatory_certifications"):
-                    certs = ', '.join(opp["mandatory_certifications"])
-                    st.write(f"**Mandatory Courses / Certifications:** {certs}")
-                if opp.get("stipend"):
-                    st.write(f"**Stipend / Compensation:** {opp.get('stipend')}")
+    type_filter = st.sidebar.selectbox("Type", ["All", *opportunity_repo.distinct("type")], key="browse_type")
+    skill_filter = st.sidebar.text_input("Skill", key="browse_skill").strip()
+    filters = (
+        None if type_filter == "All" else type_filter,
+        normalize_keywords([skill_filter])[0] if skill_filter else None
+    )
+    if filters != st.session_state.browse_filters:
+        st.session_state.browse_filters = filters
+        st.session_state.browse_pages = [None]
+
+    page = opportunity_repo.manifest(
+        after=st.session_state.browse_pages[-1], limit=browse_page_size + 1, opportunity_type=filters[0],
+        skill=filters[1]
+    )
+    has_next = len(page) > browse_page_size
+    page = page[:browse_page_size]
+
+    if page:
+        for entry in page:
+            opened = entry["key"] in st.session_state.opened_opportunities
+            with st.sidebar.expander(entry["title"] or "Untitled Opportunity", expanded=opened):
+                st.write(f"**Organization:** {entry['organization']}")
+                st.write(f"**Type:** {entry['type']}")
+                if opened:
+                    opp = opportunity_repo.get(entry["key"])
+                    if opp is not None:
+                        show_opportunity_details(opp)
+                elif st.button("📄 Show details", key=f"details-{entry['key']}"):
+                    st.session_state.opened_opportunities.add(entry["key"])
+                    st.rerun()
+
+        prev_col, page_col, next_col = st.sidebar.columns(3)
+        if prev_col.button("◀", disabled=len(st.session_state.browse_pages) == 1):
+            st.session_state.browse_pages.pop()
+            st.rerun()
+        page_col.caption(f"Page {len(st.session_state.browse_pages)}")
+        if next_col.button("▶", disabled=not has_next):
+            st.session_state.browse_pages.append(page[-1]["key"])
+            st.rerun()
+    elif any(filters):
+        st.sidebar.info("🔎 No opportunities match these filters.")
     else:
         st.sidebar.info("📭 Oops! No opportunities posted yet. Check back later.")
 
@@ -142,12 +254,29 @@ if user_type == "🎓 Student":
         resume_filename = uploaded_file.name.lower().replace(" ", "_")
         if resume_filename != st.session_state.last_uploaded_resume:
             resume_path = os.path.join(resume_storage_dir, resume_filename)
+            document_data = uploaded_file.getvalue()
             with open(resume_path, "wb") as f:
-                f.write(uploaded_file.read())
+                f.write(document_data)
 
             try:
+                pending = st.session_state.pending_resume
+                if pending is None or pending[0] != resume_filename:
+                    if pending is not None:
+                        pending[1].cancel()
+                    revision = opportunity_repo.revision()
+                    future = pipeline_runner.submit(
+                        document_data, opportunity_repo.load, threshold=match_threshold, mode=match_execution_mode,
+                        suggest=False,
+                        scorer=functools.partial(match_store.score_profile, resume_filename, threshold=match_threshold)
+                    )
+                    st.session_state.pending_resume = (resume_filename, future, revision)
+                _, future, pending_revision = st.session_state.pending_resume
+
                 with st.spinner("🔍 Analyzing your resume with AI..."):
-                    profile = extract_student_profile_from_pdf(resume_path)
+                    result = wait_for_pipeline(future)
+                st.session_state.pending_resume = None
+                st.session_state.last_trace = result.get("trace")
+                profile = result["profile"]
 
                 if not any(profile.values()):
                     st.error("😕 We couldn’t understand your resume. Try uploading a clearer version.")
@@ -157,36 +286,26 @@ if user_type == "🎓 Student":
                     st.session_state.last_uploaded_resume = resume_filename
                     st.session_state.parsed_profile = profile
 
-                    profile_json_path = os.path.join(resumes_json_dir, f"{resume_filename}.json")
-                    with open(profile_json_path, "w") as f:
-                        json.dump(profile, f, indent=2)
-
-                    matches = find_best_matches(profile_json_path, opportunity_dir, threshold=0.60)
-                    st.session_state.matches = matches
+                    profile_repo.save(resume_filename, dict(profile), result["extracted_skills"])
 
-
-                    top_opp_data = []
-                    for match in st.session_state.matches:
-                        opp_file_path = os.path.join(opportunity_dir, match['file'])
-                        with open(opp_file_path, 'r') as f:
-                            opp = json.load(f)
-                        opp["match_score"] = match['score']
-                        top_opp_data.append(opp)
-
-                    st.session_state.suggestions = generate_suggestions(profile, top_opp_data)
+                    st.session_state.matches = result["matches"]
+                    st.session_state.top_opportunities = result["top_opportunities"]
+                    st.session_state.matches_revision = pending_revision
+                    st.session_state.suggestions = None
+                    st.session_state.match_suggestions = None
 
             except Exception as e:
+                st.session_state.pending_resume = None
                 st.error(f"❌ Error processing resume: {e}")
                 st.session_state.parsed_profile = None
 
     if st.session_state.parsed_profile:
+        refresh_matches(st.session_state.last_uploaded_resume)
+
         st.subheader("🎯 Matching Opportunities")
-        if st.session_state.matches:
-            for match in st.session_state.matches:
-                opp_file_path = os.path.join(opportunity_dir, match['file'])
-                with open(opp_file_path, 'r') as f:
-                    opp_data = json.load(f)
-                match_score_percent = round(match['score'] * 100)
+        if st.session_state.top_opportunities:
+            for opp_data in st.session_state.top_opportunities:
+                match_score_percent = round(opp_data['match_score'] * 100)
                 contact_label = "Faculty" if opp_data.get('type', '').lower() == 'project' else "Contact Person"
                 with st.expander(f"{opp_data.get('title')} — Match Score: {match_score_percent}%"):
                     st.write(f"**Organization:** {opp_data.get('organization')}")
@@ -208,7 +327,31 @@ if user_type == "🎓 Student":
 
         st.markdown("---")
         st.subheader("📈 Suggestions to Improve Your Profile")
-        st.markdown(st.session_state.suggestions, unsafe_allow_html=True)
+        per_match = st.toggle("💡 Tailored advice for each top match", disabled=not st.session_state.top_opportunities)
+        if per_match:
+            if st.session_state.match_suggestions is None:
+                with st.spinner("Preparing advice for your top matches..."):
+                    st.session_state.match_suggestions = generate_match_suggestions(
+                        st.session_state.parsed_profile, st.session_state.top_opportunities
+                    )
+            for opp, advice in st.session_state.match_suggestions:
+                with st.expander(f"{opp.get('title')} — Match Score: {round(opp.get('match_score', 0) * 100)}%"):
+                    st.markdown(advice, unsafe_allow_html=True)
+        elif st.session_state.suggestions is None:
+            st.session_state.suggestions = st.write_stream(
+                stream_suggestions(st.session_state.parsed_profile, st.session_state.top_opportunities)
+            )
+        else:
+            st.markdown(st.session_state.suggestions, unsafe_allow_html=True)
+
+    if st.session_state.last_trace and st.sidebar.checkbox("🐞 Show stage timings"):
+        with st.sidebar.expander("⏱️ Last upload", expanded=True):
+            st.code("\n".join(tracing.format_tree(st.session_state.last_trace)), language=None)
+            counters = tracing.snapshot()["counters"]
+            st.dataframe(
+                [{"metric": c["name"], **c["labels"], "value": c["value"]} for c in counters],
+                hide_index=True
+            )
 
 else:
     st.header("📤 Post an Internship or Project")
@@ -231,7 +374,6 @@ else:
                 st.error("⚠️ Please complete all required fields to post your opportunity.")
             else:
                 try:
-                    safe_filename = title.lower().replace(" ", "_").replace("/", "_") + ".json"
                     opportunity_data = {
                         "title": title,
                         "organization": organization,
@@ -244,12 +386,41 @@ else:
                         "stipend": stipend,
                         "mandatory_certifications": [c.strip() for c in mandatory_certs.split(",") if c.strip()]
                     }
-                    with open(os.path.join(opportunity_dir, safe_filename), "w") as f:
-                        json.dump(opportunity_data, f, indent=2)
+                    opportunity_key = opportunity_repo.add(opportunity_data)
+                    match_store.score_opportunity(opportunity_key, opportunity_data, profile_repo.load())
                     st.success("✅ Opportunity posted successfully!")
                 except Exception as e:
                     st.error(f"🚨 Something went wrong while saving. Please try again: {e}")
 
+    st.header("🏆 Rank Stored Candidates")
+    posted = opportunity_repo.load()
+    if posted:
+        selected_file = st.selectbox(
+            "Opportunity",
+            list(posted),
+            format_func=lambda f: f"{posted[f].get('title', 'Untitled Opportunity')} — {posted[f].get('organization', '')}"
+        )
+        top_k = st.slider("Number of candidates", min_value=1, max_value=50, value=10)
+        if st.button("🔎 Find Top Candidates"):
+            candidates = profile_repo.load()
+            if not candidates:
+                st.info("📭 No parsed resumes stored yet.")
+            else:
+                with st.spinner("Ranking candidates..."):
+                    ranked = rank_candidates(posted[selected_file], candidates, top_k=top_k)
+                for rank, candidate in enumerate(ranked, start=1):
+                    details = candidate["details"]
+                    with st.expander(f"#{rank} {candidate['name'] or candidate['file']} — Match Score: {round(candidate['score'] * 100)}%"):
+                        st.write(f"**Email:** {candidate['email'] or 'Not provided'}")
+                        st.write(f"**Skills:** {', '.join(candidates[candidate['file']].get('extracted_skills', []))}")
+                        st.write(
+                            f"**Exact overlap:** {details['overlap_score']} · "
+                            f"**Fuzzy overlap:** {details['fuzzy_score']} · "
+                            f"**Certifications:** {details['cert_score']}"
+                        )
+    else:
+        st.info("📭 Post an opportunity to rank candidates against it.")
+
 st.markdown("""
 ---
 <center>
@@ -0,0 +1,133 @@
+import time
+import asyncio
+import hashlib
+from types import SimpleNamespace
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+from utils import resources
+
+
+def _entities(document: str):
+    found = resources.get("skill_gazetteer").find_all(document)
+    found += [word.strip(".,;:") for word in document.split() if word[:1].isupper()]
+    return SimpleNamespace(
+        is_error=False,
+        entities=[SimpleNamespace(text=text, category="Skill") for text in dict.fromkeys(found) if text]
+    )
+
+
+class FakeTextAnalyticsClient:
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.calls = 0
+
+    def recognize_entities(self, documents: List[str]):
+        self.calls += 1
+        time.sleep(self.latency)
+        return [_entities(doc) for doc in documents]
+
+
+class FakeAsyncTextAnalyticsClient(FakeTextAnalyticsClient):
+    async def recognize_entities(self, documents: List[str]):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return [_entities(doc) for doc in documents]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _analyze_result(profile: dict):
+    def field(value):
+        return SimpleNamespace(content="\n".join(value) if isinstance(value, list) else value)
+
+    fields = {
+        "Name": field(profile.get("name", "")),
+        "Email": field(profile.get("email", "")),
+        "Phone": field(profile.get("phone", "")),
+        "SocialLinks": field(profile.get("social_links", [])),
+        "Objective": field(profile.get("objective", "")),
+        "Certifications": field(profile.get("certifications", [])),
+        "Skills": field(profile.get("skills", [])),
+        "Experience": field(profile.get("experience", [])),
+        "Projects": field(profile.get("projects", [])),
+        "Education": field(profile.get("education", [])),
+    }
+    return SimpleNamespace(documents=[SimpleNamespace(fields=fields)])
+
+
+class _Poller:
+    def __init__(self, result, latency: float):
+        self._result = result
+        self.latency = latency
+
+    def result(self):
+        time.sleep(self.latency)
+        return self._result
+
+
+class _AsyncPoller(_Poller):
+    async def result(self):
+        await asyncio.sleep(self.latency)
+        return self._result
+
+
+class FakeDocumentIntelligenceClient:
+    def __init__(self, profile: dict, latency: float = 0.5):
+        self.profile = profile
+        self.latency = latency
+        self.calls = 0
+
+    def begin_analyze_document(self, model_id: str, body: bytes, content_type: str = None):
+        self.calls += 1
+        return _Poller(_analyze_result(self.profile), self.latency)
+
+
+class FakeAsyncDocumentIntelligenceClient(FakeDocumentIntelligenceClient):
+    async def begin_analyze_document(self, model_id: str, body: bytes, content_type: str = None):
+        self.calls += 1
+        return _AsyncPoller(_analyze_result(self.profile), self.latency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSuggestionChain:
+    def __init__(self, first_token_latency: float = 0.2, token_latency: float = 0.01, tokens: int = 60):
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.tokens = tokens
+        self.calls = 0
+
+    def stream(self, inputs: Dict) -> Iterator[str]:
+        self.calls += 1
+        time.sleep(self.first_token_latency)
+        yield f"* Learn the skills listed for {inputs.get('opp_title', 'this role')}"
+        for i in range(self.tokens - 1):
+            time.sleep(self.token_latency)
+            yield f" step{i}"
+
+    def invoke(self, inputs: Dict) -> str:
+        return "".join(self.stream(inputs))
+
+
+class FakeSentenceEncoder:
+    def __init__(self, dimensions: int = 384, latency_per_item: float = 0.0005):
+        self.dimensions = dimensions
+        self.latency_per_item = latency_per_item
+
+    def encode(self, items: List[str], convert_to_numpy: bool = True):
+        time.sleep(self.latency_per_item * len(items))
+        vectors = np.empty((len(items), self.dimensions), dtype=np.float32)
+        for row, item in enumerate(items):
+            seed = int.from_bytes(hashlib.sha256(item.encode("utf-8")).digest()[:8], "little")
+            vectors[row] = np.random.default_rng(seed).standard_normal(self.dimensions)
+        return vectors
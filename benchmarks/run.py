@@ -0,0 +1,264 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from typing import Callable, Dict, List
+
+from utils import resources, smart_matcher, form_recognizer
+from utils.embedding_cache import EmbeddingCache
+from utils.parse_cache import ParseCache
+from utils.entity_extractor import extract_skills_from_resume
+from utils.smart_matcher import find_best_matches, embed_list
+from benchmarks.synthetic import SyntheticCorpus, resume_pdf
+from benchmarks.fakes import (
+    FakeTextAnalyticsClient,
+    FakeAsyncTextAnalyticsClient,
+    FakeDocumentIntelligenceClient,
+    FakeAsyncDocumentIntelligenceClient,
+    FakeSuggestionChain,
+    FakeSentenceEncoder
+)
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+DEFAULT_OUTPUT = "benchmarks/results/latest.json"
+
+
+def timed(fn: Callable, repeat: int, setup: Callable = None) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "runs": repeat,
+        "first": samples[0],
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "max": max(samples),
+    }
+
+
+class BenchmarkContext:
+    def __init__(self, args: argparse.Namespace, workdir: str):
+        self.args = args
+        self.workdir = workdir
+        self.corpus_seed = args.seed
+        self.text_client = FakeTextAnalyticsClient(args.text_analytics_latency)
+        self.async_text_client = FakeAsyncTextAnalyticsClient(args.text_analytics_latency)
+        self._dirs = 0
+
+    def fresh_dir(self, prefix: str) -> str:
+        self._dirs += 1
+        return os.path.join(self.workdir, f"{prefix}-{self._dirs}")
+
+    def corpus(self) -> SyntheticCorpus:
+        return SyntheticCorpus(self.corpus_seed)
+
+    def reset_embedding_cache(self):
+        smart_matcher.embedding_cache = EmbeddingCache(smart_matcher.MODEL_NAME, cache_dir=self.fresh_dir("embeddings"))
+
+    def reset_parse_cache(self):
+        form_recognizer.parse_cache = ParseCache(cache_dir=self.fresh_dir("parse"))
+
+
+def bench_find_best_matches(ctx: BenchmarkContext, size: int) -> Dict[str, float]:
+    corpus = ctx.corpus()
+    opportunities = corpus.opportunities(size)
+    resume_path = os.path.join(ctx.workdir, "student.json")
+    with open(resume_path, "w") as f:
+        json.dump(corpus.resume(0), f)
+    return timed(
+        lambda: find_best_matches(resume_path, None, ctx.args.threshold, opportunities=opportunities),
+        ctx.args.repeat
+    )
+
+
+def bench_extract_skills(ctx: BenchmarkContext, size: int) -> Dict[str, float]:
+    resumes = ctx.corpus().resumes(min(size, ctx.args.extract_sample))
+    stats = timed(lambda: [extract_skills_from_resume(resume) for resume in resumes], ctx.args.repeat)
+    stats["documents"] = len(resumes)
+    return stats
+
+
+def _embedding_items(ctx: BenchmarkContext, size: int) -> List[str]:
+    items = []
+    for opp in ctx.corpus().opportunities(size).values():
+        items.extend(opp["mandatory_certifications"])
+        items.append(opp["title"])
+    return items
+
+
+def bench_embed_list_cold(ctx: BenchmarkContext, size: int) -> Dict[str, float]:
+    items = _embedding_items(ctx, size)
+    stats = timed(lambda: embed_list(items), ctx.args.repeat, setup=ctx.reset_embedding_cache)
+    stats["items"] = len(items)
+    return stats
+
+
+def bench_embed_list_warm(ctx: BenchmarkContext, size: int) -> Dict[str, float]:
+    items = _embedding_items(ctx, size)
+    ctx.reset_embedding_cache()
+    embed_list(items)
+    stats = timed(lambda: embed_list(items), ctx.args.repeat)
+    stats["items"] = len(items)
+    return stats
+
+
+def bench_upload_pipeline(ctx: BenchmarkContext, size: int) -> Dict[str, float]:
+    from utils import suggestion_generator
+    from utils.async_pipeline import run_resume_pipeline
+
+    corpus = ctx.corpus()
+    opportunities = corpus.opportunities(size)
+    resume = corpus.resume(0)
+    document_data = resume_pdf(resume)
+    document_client = FakeAsyncDocumentIntelligenceClient(resume, ctx.args.document_latency)
+
+    def setup():
+        ctx.reset_parse_cache()
+        suggestion_generator._suggestion_cache.clear()
+
+    def upload():
+        asyncio.run(run_resume_pipeline(
+            document_data, lambda: opportunities, threshold=ctx.args.threshold,
+            text_client=ctx.async_text_client, document_client=document_client
+        ))
+
+    return timed(upload, ctx.args.repeat, setup=setup)
+
+
+def bench_suggestions_per_match(ctx: BenchmarkContext, size: int) -> Dict[str, float]:
+    from utils import suggestion_generator
+
+    corpus = ctx.corpus()
+    student = corpus.resume(0)
+    opportunities = [
+        dict(opp, match_score=1.0 - i / size)
+        for i, opp in enumerate(corpus.opportunities(size).values())
+    ]
+    stats = timed(
+        lambda: suggestion_generator.generate_match_suggestions(
+            student, opportunities, top_k=ctx.args.suggestion_top_k, max_concurrency=ctx.args.suggestion_concurrency
+        ),
+        ctx.args.repeat,
+        setup=suggestion_generator._suggestion_cache.clear
+    )
+    stats["suggestions"] = min(ctx.args.suggestion_top_k, size)
+    return stats
+
+
+SCENARIOS = {
+    "find_best_matches": bench_find_best_matches,
+    "extract_skills_from_resume": bench_extract_skills,
+    "embed_list_cold": bench_embed_list_cold,
+    "embed_list_warm": bench_embed_list_warm,
+    "upload_pipeline": bench_upload_pipeline,
+    "suggestions_per_match": bench_suggestions_per_match,
+}
+
+
+def install_fakes(ctx: BenchmarkContext):
+    args = ctx.args
+    resources.override("text_analytics_client", ctx.text_client)
+    resources.override("document_intelligence_client", FakeDocumentIntelligenceClient({}, args.document_latency))
+    resources.override("suggestion_chain", FakeSuggestionChain(args.llm_first_token_latency, args.llm_token_latency))
+    if args.fake_encoder:
+        resources.override("sentence_transformer", FakeSentenceEncoder())
+    if args.resume_parser:
+        form_recognizer.RESUME_PARSER = args.resume_parser
+    ctx.reset_embedding_cache()
+    ctx.reset_parse_cache()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict) -> List[str]:
+    previous = {(r["scenario"], r["size"]): r for r in baseline.get("results", [])}
+    lines = []
+    for result in current["results"]:
+        before = previous.get((result["scenario"], result["size"]))
+        if before is None or "error" in result or "error" in before:
+            continue
+        ratio = result["stats"]["median"] / max(before["stats"]["median"], 1e-9)
+        lines.append(f"{result['scenario']:<28} {result['size']:>6}  {ratio:6.2f}x  "
+                     f"({before['stats']['median']:.4f}s -> {result['stats']['median']:.4f}s)")
+    return lines
+
+
+def run(args: argparse.Namespace) -> dict:
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory(prefix="skillconnect-bench-") as workdir:
+        ctx = BenchmarkContext(args, workdir)
+        install_fakes(ctx)
+        for name in args.scenarios:
+            for size in args.sizes:
+                entry = {"scenario": name, "size": size}
+                try:
+                    entry["stats"] = SCENARIOS[name](ctx, size)
+                    print(f"{name:<28} {size:>6}  median {entry['stats']['median']:.4f}s")
+                except Exception as e:
+                    entry["error"] = str(e)
+                    print(f"{name:<28} {size:>6}  failed: {e}")
+                report["results"].append(entry)
+    return report
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark matching against synthetic data and local service fakes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Opportunity counts to test")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threshold", type=float, default=0.60)
+    parser.add_argument("--extract-sample", type=int, default=50, help="Maximum resumes per extraction run")
+    parser.add_argument("--text-analytics-latency", type=float, default=0.05)
+    parser.add_argument("--document-latency", type=float, default=0.5)
+    parser.add_argument("--llm-first-token-latency", type=float, default=0.2)
+    parser.add_argument("--llm-token-latency", type=float, default=0.01)
+    parser.add_argument("--suggestion-top-k", type=int, default=3)
+    parser.add_argument("--suggestion-concurrency", type=int, default=3)
+    parser.add_argument("--fake-encoder", action="store_true", help="Replace the sentence transformer with a hashing encoder")
+    parser.add_argument("--resume-parser", choices=["auto", "local", "azure"], help="Override RESUME_PARSER")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--compare", help="Earlier results file to compare medians against")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    if os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        print("\n".join(compare(report, baseline)))
+    return 0 if not any("error" in r for r in report["results"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import os
+import json
+import random
+from typing import Dict, List
+
+try:
+    import pymupdf
+except ImportError:
+    import fitz as pymupdf
+
+from utils.entity_extractor import KNOWN_SKILLS, normalize_keywords
+from utils.skill_index import opportunity_content_hash
+
+SAMPLE_JSON_DIR = "data/json"
+OPPORTUNITY_TYPES = ["Internship", "Project"]
+
+
+def _load_samples(directory: str) -> List[dict]:
+    samples = []
+    if not os.path.isdir(directory):
+        return samples
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".json"):
+            with open(os.path.join(directory, filename), "r") as f:
+                samples.append(json.load(f))
+    return samples
+
+
+class SyntheticCorpus:
+    def __init__(self, seed: int = 0, sample_dir: str = SAMPLE_JSON_DIR):
+        self.rng = random.Random(seed)
+        self.skills = sorted(KNOWN_SKILLS)
+        self.opportunity_samples = _load_samples(os.path.join(sample_dir, "opportunities"))
+        self.resume_samples = _load_samples(os.path.join(sample_dir, "resumes"))
+        self.opportunity_certifications = [
+            c for s in self.opportunity_samples for c in s.get("mandatory_certifications", [])
+        ]
+        self.resume_certifications = [c for s in self.resume_samples for c in s.get("certifications", [])]
+
+    def _pick(self, samples: List[dict], field: str, default):
+        values = [s[field] for s in samples if s.get(field)]
+        return self.rng.choice(values) if values else default
+
+    def _sentence(self, skills: List[str]) -> str:
+        verb = self.rng.choice(["Built", "Designed", "Maintained", "Automated", "Analysed", "Deployed"])
+        return f"{verb} a solution using {', '.join(skills)}."
+
+    def opportunity(self, index: int) -> dict:
+        skills = self.rng.sample(self.skills, self.rng.randint(3, 10))
+        opp = {
+            "title": f"{self._pick(self.opportunity_samples, 'title', 'Intern')} #{index}",
+            "organization": self._pick(self.opportunity_samples, "organization", "SkillConnect Labs"),
+            "type": self.rng.choice(OPPORTUNITY_TYPES),
+            "required_skills": skills,
+            "duration": self._pick(self.opportunity_samples, "duration", "3 months, Remote"),
+            "description": f"{self._pick(self.opportunity_samples, 'description', '')} {self._sentence(skills[:3])}",
+            "role": "\n".join(self._sentence(self.rng.sample(skills, min(2, len(skills)))) for _ in range(3)),
+            "faculty": "",
+            "stipend": "",
+            "mandatory_certifications": (
+                self.rng.sample(self.opportunity_certifications, 1)
+                if self.opportunity_certifications and self.rng.random() < 0.5 else []
+            ),
+        }
+        opp["extracted_skills"] = normalize_keywords(skills)
+        opp["skills_hash"] = opportunity_content_hash(opp)
+        return opp
+
+    def opportunities(self, count: int) -> Dict[str, dict]:
+        return {f"synthetic_opportunity_{i:05d}": self.opportunity(i) for i in range(count)}
+
+    def resume(self, index: int) -> dict:
+        skills = self.rng.sample(self.skills, self.rng.randint(5, 15))
+        return {
+            "name": f"Student {index}",
+            "email": f"student{index}@example.edu",
+            "phone": "",
+            "social_links": [],
+            "objective": self._pick(self.resume_samples, "objective", ""),
+            "certifications": self.rng.sample(self.resume_certifications, min(len(self.resume_certifications), 2)),
+            "skills": [", ".join(skills)],
+            "experience": [self._sentence(self.rng.sample(skills, 2)) for _ in range(2)],
+            "projects": [self._sentence(self.rng.sample(skills, 3)) for _ in range(3)],
+            "education": self._pick(self.resume_samples, "education", ["B.Tech Computer Science"]),
+            "education_raw": "",
+        }
+
+    def resumes(self, count: int) -> List[dict]:
+        return [self.resume(i) for i in range(count)]
+
+
+def resume_pdf(resume: dict) -> bytes:
+    lines = [resume["name"], resume["email"], "", "Objective", resume.get("objective", "")]
+    for heading, field in (("Education", "education"), ("Skills", "skills"), ("Experience", "experience"),
+                           ("Projects", "projects"), ("Certifications", "certifications")):
+        lines.append("")
+        lines.append(heading)
+        lines.extend(f"• {item}" for item in resume.get(field, []))
+
+    doc = pymupdf.open()
+    page = doc.new_page()
+    page.insert_textbox(page.rect + (50, 50, -50, -50), "\n".join(lines), fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
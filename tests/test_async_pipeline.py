@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+import pytest
+
+from utils import async_pipeline
+from utils.async_pipeline import PipelineStageTimeout, run_resume_pipeline
+
+
+@pytest.fixture
+def parsed_resume(monkeypatch):
+    async def parse(document_data, document_client=None):
+        return {"name": "Ada", "skills": ["Python"], "certifications": []}
+
+    async def extract(profile, text_client=None):
+        return ["python"]
+
+    monkeypatch.setattr(async_pipeline, "parse_resume_async", parse)
+    monkeypatch.setattr(async_pipeline, "extract_resume_skills_async", extract)
+    monkeypatch.setattr(async_pipeline, "embed_list", lambda items: [])
+
+
+def test_slow_catalog_load_times_out(parsed_resume):
+    def load_opportunities():
+        time.sleep(0.5)
+        return {}
+
+    with pytest.raises(PipelineStageTimeout, match="'load'"):
+        asyncio.run(run_resume_pipeline(b"%PDF", load_opportunities, timeouts={"load": 0.05}, suggest=False))
+
+
+def test_catalog_load_feeds_scoring(parsed_resume):
+    scored = {}
+
+    def scorer(student_json, opportunities):
+        scored.update(opportunities)
+        return {key: {"final_score": 0.9} for key in opportunities}
+
+    opportunities = {"python.json": {"title": "Python Developer"}}
+    result = asyncio.run(run_resume_pipeline(b"%PDF", lambda: opportunities, scorer=scorer, suggest=False))
+
+    assert scored == opportunities
+    assert [opp["title"] for opp in result["top_opportunities"]] == ["Python Developer"]
+    assert "stage.load" in str(result["trace"])
@@ -0,0 +1,81 @@
+import csv
+import json
+
+import pytest
+
+from utils import batch_matcher
+from utils.skill_index import opportunity_content_hash
+
+
+def fake_match_resume(path, threshold):
+    with open(path) as f:
+        score = json.load(f)["score"]
+    return [{"file": "python.json", "score": score,
+             "details": {"overlap_score": score, "fuzzy_score": 0.0, "cert_score": 0.0}}]
+
+
+@pytest.fixture
+def batch_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_matcher, "match_resume", fake_match_resume)
+    resumes, opportunities = tmp_path / "resumes", tmp_path / "opportunities"
+    resumes.mkdir()
+    opportunities.mkdir()
+    opp = {"title": "Python Developer", "required_skills": ["Python"], "mandatory_certifications": [],
+           "extracted_skills": ["python"]}
+    opp["skills_hash"] = opportunity_content_hash(opp)
+    (opportunities / "python.json").write_text(json.dumps(opp))
+    for name, score in [("ada.json", 0.9), ("alan.json", 0.8), ("grace.json", 0.7)]:
+        (resumes / name).write_text(json.dumps({"name": name, "score": score}))
+    return resumes, opportunities, tmp_path
+
+
+def interrupt_after(count, monkeypatch):
+    write = batch_matcher.ResultWriter.write
+    calls = []
+
+    def interrupting_write(self, resume, matches):
+        write(self, resume, matches)
+        calls.append(resume)
+        if len(calls) == count:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(batch_matcher.ResultWriter, "write", interrupting_write)
+    return lambda: monkeypatch.setattr(batch_matcher.ResultWriter, "write", write)
+
+
+def output_rows(path, output_format):
+    with open(path, newline="") as f:
+        if output_format == "csv":
+            return sorted(row["resume"] for row in csv.DictReader(f))
+        return sorted(json.loads(line)["resume"] for line in f)
+
+
+@pytest.mark.parametrize("output_format", ["jsonl", "csv"])
+def test_interrupted_run_resumes_without_duplicate_rows(batch_dirs, monkeypatch, output_format):
+    resumes, opportunities, tmp_path = batch_dirs
+    output = str(tmp_path / f"results.{output_format}")
+    restore = interrupt_after(2, monkeypatch)
+    with pytest.raises(KeyboardInterrupt):
+        batch_matcher.run_batch(str(resumes), str(opportunities), output, output_format, workers=1)
+    assert len(batch_matcher.read_checkpoint(f"{output}.checkpoint")) == 1
+    assert len(output_rows(output, output_format)) == 2
+
+    restore()
+    stats = batch_matcher.run_batch(str(resumes), str(opportunities), output, output_format, workers=1)
+
+    assert stats == {"skipped": 1, "scored": 2, "failed": 0}
+    assert output_rows(output, output_format) == ["ada.json", "alan.json", "grace.json"]
+
+
+def test_changed_resume_is_rescored(batch_dirs):
+    resumes, opportunities, tmp_path = batch_dirs
+    output = str(tmp_path / "results.jsonl")
+    batch_matcher.run_batch(str(resumes), str(opportunities), output, workers=1)
+    (resumes / "ada.json").write_text(json.dumps({"name": "ada.json", "score": 0.95}))
+
+    stats = batch_matcher.run_batch(str(resumes), str(opportunities), output, workers=1)
+
+    assert stats == {"skipped": 2, "scored": 1, "failed": 0}
+    with open(output) as f:
+        rows = {row["resume"]: row["matches"][0]["score"] for row in map(json.loads, f)}
+    assert rows == {"ada.json": 0.95, "alan.json": 0.8, "grace.json": 0.7}
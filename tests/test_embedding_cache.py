@@ -0,0 +1,28 @@
+import numpy as np
+
+from utils import resources, smart_matcher
+from utils.embedding_cache import EmbeddingCache
+
+
+class FakeEncoder:
+    def encode(self, items, convert_to_numpy=True):
+        rng = np.random.default_rng(len(items))
+        return rng.standard_normal((len(items), 8)).astype(np.float32) / 3
+
+
+def test_memory_and_disk_tiers_return_identical_vectors(tmp_path, monkeypatch):
+    resources.override("sentence_transformer", FakeEncoder())
+    monkeypatch.setattr(smart_matcher, "embedding_cache", EmbeddingCache("fake", cache_dir=str(tmp_path)))
+    try:
+        items = ["AWS Cloud Practitioner", "Google Data Analytics"]
+        fresh = smart_matcher.embed_list(items)
+        warm = smart_matcher.embed_list(items)
+        monkeypatch.setattr(smart_matcher, "embedding_cache", EmbeddingCache("fake", cache_dir=str(tmp_path)))
+        restarted = smart_matcher.embed_list(items)
+    finally:
+        resources.reset("sentence_transformer")
+
+    for a, b, c in zip(fresh, warm, restarted):
+        assert a.dtype == b.dtype == c.dtype == np.float32
+        assert np.array_equal(a, b)
+        assert np.array_equal(a, c)
@@ -0,0 +1,94 @@
+import threading
+from types import SimpleNamespace
+
+from utils import entity_extractor
+from utils.entity_extractor import (
+    TEXT_ANALYTICS_MAX_CHARACTERS,
+    TEXT_ANALYTICS_MAX_DOCUMENTS,
+    chunk_text,
+    plan_entity_batches,
+    extract_entities_batch
+)
+
+
+class RecordingTextClient:
+    def __init__(self, fail_on: str = None):
+        self.fail_on = fail_on
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def recognize_entities(self, documents):
+        with self._lock:
+            self.batches.append(list(documents))
+        if self.fail_on and any(self.fail_on in doc for doc in documents):
+            raise RuntimeError("service unavailable")
+        return [
+            SimpleNamespace(is_error=False, entities=[
+                SimpleNamespace(text=word, category="Skill") for word in doc.split() if word.isupper()
+            ])
+            for doc in documents
+        ]
+
+
+def words(count: int, word: str = "abcd") -> str:
+    return " ".join([word] * count)
+
+
+def test_chunk_text_keeps_text_at_the_limit_in_one_chunk():
+    text = "a" * TEXT_ANALYTICS_MAX_CHARACTERS
+    assert chunk_text(text) == [text]
+
+
+def test_chunk_text_splits_on_whitespace_past_the_limit():
+    text = words(2000)
+    chunks = chunk_text(text)
+    assert len(chunks) == 2
+    assert all(len(chunk) <= TEXT_ANALYTICS_MAX_CHARACTERS for chunk in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_chunk_text_hard_splits_unbroken_text():
+    text = "x" * (TEXT_ANALYTICS_MAX_CHARACTERS + 1)
+    assert [len(chunk) for chunk in chunk_text(text)] == [TEXT_ANALYTICS_MAX_CHARACTERS, 1]
+
+
+def test_plan_entity_batches_groups_chunks_in_fives():
+    texts = [words(2000), "short", words(3000), "", "tail"]
+    batches, owners = plan_entity_batches(texts)
+    assert [len(batch) for batch in batches] == [TEXT_ANALYTICS_MAX_DOCUMENTS, 2]
+    assert owners == [0, 0, 1, 2, 2, 2, 4]
+
+
+def test_extract_entities_batch_sends_batches_of_five():
+    client = RecordingTextClient()
+    texts = [f"doc{i} PYTHON" for i in range(12)]
+    entities = extract_entities_batch(texts, text_client=client, max_concurrency=1)
+    assert [len(batch) for batch in client.batches] == [5, 5, 2]
+    assert entities == [["PYTHON"]] * 12
+
+
+def test_extract_entities_batch_merges_entities_across_chunks():
+    client = RecordingTextClient()
+    long_text = "PYTHON " + words(2000) + " SQL PYTHON"
+    entities = extract_entities_batch([long_text, "FLASK"], text_client=client, max_concurrency=4)
+    assert len(client.batches) == 1
+    assert len(client.batches[0]) == 3
+    assert sorted(entities[0]) == ["PYTHON", "SQL"]
+    assert entities[1] == ["FLASK"]
+
+
+def test_extract_entities_batch_isolates_failed_batches():
+    client = RecordingTextClient(fail_on="BROKEN")
+    texts = ["BROKEN"] + [f"doc{i} AWS" for i in range(5)]
+    entities = extract_entities_batch(texts, text_client=client, max_concurrency=2)
+    assert entities[:5] == [[]] * 5
+    assert entities[5] == ["AWS"]
+
+
+def test_extract_skills_uses_injected_client(monkeypatch):
+    monkeypatch.setattr(entity_extractor, "filter_entities_by_pos", lambda ents: {ent: True for ent in ents})
+    client = RecordingTextClient()
+    resume = {"skills": ["Languages: Python"], "projects": ["Built with FLASK"], "experience": [], "certifications": []}
+    skills = entity_extractor.extract_skills_from_resume(resume, text_client=client, backend="azure")
+    assert client.batches
+    assert sorted(skills) == ["flask", "python"]
@@ -0,0 +1,27 @@
+from utils.local_parser import parse_resume_locally
+
+
+def parse_sample(name: str) -> tuple:
+    with open(f"Sample_resumes/{name}", "rb") as f:
+        return parse_resume_locally(f.read())
+
+
+def test_wrapped_entries_join_onto_their_item():
+    profile, confidence = parse_sample("resume1.pdf")
+    assert confidence == 1.0
+    assert profile["experience"][0] == (
+        "Software Development Intern – NexaTech Solutions, New York, NY June 2024 – August 2024"
+    )
+    assert profile["education"] == [
+        "B.S. in Computer Science, Seton Hall University, South Orange, NJ Expected Graduation: May 2025 | GPA: 3.8/4.0"
+    ]
+    assert len(profile["projects"]) == 6
+
+
+def test_indented_and_hyphenated_continuations():
+    profile, _ = parse_sample("resume6.pdf")
+    assert profile["experience"][0] == "Software Engineering Intern – CloudNova Systems, Pune Jan 2024 – Apr 2024"
+    assert profile["projects"][1].endswith("Scikit-learn. Integrated it with a web dashboard using Flask.")
+
+    profile, _ = parse_sample("resume2.pdf")
+    assert "solve real-world problems" in profile["objective"]
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+import spacy
+
+from utils import entity_extractor, resources
+from utils.skill_index import is_opportunity_indexed, load_indexed_opportunity
+from utils.store import SkillStore
+
+
+@pytest.fixture
+def local_extractor(tmp_path, monkeypatch):
+    monkeypatch.setattr(entity_extractor, "SKILL_EXTRACTION_BACKEND", "local")
+    resources.override("spacy_nlp", spacy.blank("en"))
+    original = tmp_path / "original_skills.txt"
+    original.write_text("\n".join(sorted(entity_extractor.KNOWN_SKILLS)))
+    yield
+    resources.reset("spacy_nlp")
+    entity_extractor.load_known_skills(str(original))
+
+
+def use_vocabulary(tmp_path, skills):
+    path = tmp_path / "skills.txt"
+    path.write_text("\n".join(skills))
+    entity_extractor.load_known_skills(str(path))
+
+
+def test_vocabulary_change_reextracts_json_opportunities(tmp_path, local_extractor):
+    use_vocabulary(tmp_path, ["python"])
+    path = tmp_path / "opportunity.json"
+    path.write_text(json.dumps({"role": "Engineer", "description": "Python and Kubernetes work",
+                                "required_skills": [], "mandatory_certifications": []}))
+    assert load_indexed_opportunity(str(path))["extracted_skills"] == ["python"]
+
+    use_vocabulary(tmp_path, ["python", "kubernetes"])
+    with open(path) as f:
+        assert not is_opportunity_indexed(json.load(f))
+    assert sorted(load_indexed_opportunity(str(path))["extracted_skills"]) == ["kubernetes", "python"]
+
+
+def test_vocabulary_change_reextracts_stored_documents(tmp_path, local_extractor):
+    use_vocabulary(tmp_path, ["python"])
+    store = SkillStore(str(tmp_path / "store.db"))
+    store.opportunities.save("engineer", {"title": "Engineer", "description": "Python and Kubernetes work",
+                                          "required_skills": [], "mandatory_certifications": []})
+    store.profiles.save("ada", {"name": "Ada", "skills": ["Python"], "projects": ["Kubernetes operator"]})
+    assert store.opportunities.load()["engineer"]["extracted_skills"] == ["python"]
+
+    use_vocabulary(tmp_path, ["python", "kubernetes"])
+    assert sorted(store.opportunities.load()["engineer"]["extracted_skills"]) == ["kubernetes", "python"]
+    assert sorted(store.profiles.load()["ada"]["extracted_skills"]) == ["kubernetes", "python"]
+    assert sorted(store.opportunities.get("engineer")["extracted_skills"]) == ["kubernetes", "python"]
@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+
+from utils import resources, smart_matcher
+from utils.embedding_cache import EmbeddingCache
+from utils.skill_index import opportunity_content_hash
+
+
+class FakeEncoder:
+    def encode(self, items, convert_to_numpy=True):
+        rng = np.random.default_rng(len(items))
+        return rng.standard_normal((len(items), 8)).astype(np.float32)
+
+
+def indexed(skills, certs=()):
+    opp = {"role": "Engineer", "required_skills": skills, "mandatory_certifications": list(certs)}
+    opp["extracted_skills"] = [skill.lower() for skill in skills]
+    opp["skills_hash"] = opportunity_content_hash(opp)
+    return opp
+
+
+def test_malformed_posting_does_not_drop_the_ranking(tmp_path, monkeypatch):
+    resources.override("sentence_transformer", FakeEncoder())
+    monkeypatch.setattr(smart_matcher, "embedding_cache", EmbeddingCache("fake", cache_dir=str(tmp_path)))
+    opportunities = {
+        "python.json": indexed(["Python", "SQL"]),
+        "cloud.json": indexed(["AWS", "Python"], certs=["AWS Cloud Practitioner"]),
+        "null.json": dict(indexed(["Python"]), extracted_skills=None),
+        "string_certs.json": dict(indexed(["Python"]), mandatory_certifications="AWS Cloud Practitioner"),
+    }
+    student = {"extracted_skills": ["python", "sql"], "certifications": ["AWS Cloud Practitioner"]}
+    try:
+        results = smart_matcher.score_opportunities(student, opportunities)
+        pruned = smart_matcher.score_opportunities(student, opportunities, threshold=0.3)
+    finally:
+        resources.reset("sentence_transformer")
+
+    assert set(results) == {"python.json", "cloud.json"}
+    assert results["python.json"]["overlap_score"] == 1.0
+    assert set(pruned) <= set(results)
+    assert "python.json" in pruned
+
+
+def test_load_opportunities_skips_malformed_files(tmp_path):
+    (tmp_path / "good.json").write_text(json.dumps(indexed(["Python"])))
+    (tmp_path / "bad.json").write_text(json.dumps(dict(indexed(["Python"]), required_skills="Python")))
+
+    assert list(smart_matcher.load_opportunities(str(tmp_path))) == ["good.json"]
+
+
+def index_state(indexes):
+    inverted_index, fuzzy_index, skill_matrix = indexes
+    skills = ["python", "sql", "aws", "react", "docker"]
+    return (
+        dict(inverted_index.postings), dict(inverted_index.raw_postings),
+        inverted_index.skill_counts, inverted_index.distinct_counts,
+        fuzzy_index.vocabulary, dict(fuzzy_index._postings),
+        skill_matrix.overlap_by_key(skills, inverted_index.keys()),
+    )
+
+
+def test_catalog_indexes_are_patched_for_small_changes(monkeypatch):
+    monkeypatch.setattr(smart_matcher, "_catalog_indexes", None)
+    pool = ["Python", "SQL", "AWS", "React", "Docker", "Kubernetes", "Excel", "Tableau"]
+    catalog = {f"opp{i:02d}.json": indexed(pool[i % 8:i % 8 + 3]) for i in range(24)}
+    before = smart_matcher.catalog_indexes(catalog)
+    before_state = index_state(before)
+
+    updated = dict(catalog)
+    del updated["opp00.json"]
+    updated["opp01.json"] = indexed(["Rust", "Python"])
+    updated["new.json"] = indexed(["Pythonn", "Go"])
+    updated["bad.json"] = dict(indexed(["SQL"]), extracted_skills=None)
+    after = smart_matcher.catalog_indexes(updated)
+
+    assert after[2].vocabulary is before[2].vocabulary
+    assert index_state(after) == index_state(smart_matcher._build_catalog_indexes(updated)[2:])
+    assert index_state(before) == before_state
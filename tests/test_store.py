@@ -0,0 +1,54 @@
+import time
+
+from utils.match_store import MatchStore
+from utils.skill_index import opportunity_content_hash, resume_content_hash
+from utils.store import SkillStore
+
+
+def indexed_opportunity(title, skills):
+    opp = {"title": title, "required_skills": skills, "mandatory_certifications": []}
+    opp["extracted_skills"] = [skill.lower() for skill in skills]
+    opp["skills_hash"] = opportunity_content_hash(opp)
+    return opp
+
+
+def indexed_profile(name, skills):
+    profile = {"name": name, "skills": skills}
+    profile["extracted_skills"] = [skill.lower() for skill in skills]
+    profile["skills_hash"] = resume_content_hash(profile)
+    return profile
+
+
+def test_load_keeps_unchanged_documents(tmp_path):
+    store = SkillStore(str(tmp_path / "store.db"))
+    for title in ["alpha", "beta", "gamma"]:
+        store.opportunities.save(title, indexed_opportunity(title, ["Python"]))
+    first = store.opportunities.load()
+
+    store.opportunities.save("beta", indexed_opportunity("beta", ["SQL"]))
+    store.opportunities.delete("gamma")
+    second = store.opportunities.load()
+
+    assert list(second) == ["alpha", "beta"]
+    assert second["alpha"] is first["alpha"]
+    assert second["beta"]["extracted_skills"] == ["sql"]
+    assert store.opportunities.load() is second
+
+
+def test_delete_removes_match_results(tmp_path):
+    store = SkillStore(str(tmp_path / "store.db"))
+    match_store = MatchStore(store)
+    store.opportunities.save("alpha", indexed_opportunity("alpha", ["Python"]))
+    store.opportunities.save("beta", indexed_opportunity("beta", ["SQL"]))
+    store.profiles.save("ada", indexed_profile("Ada", ["Python"]))
+    store.profiles.save("alan", indexed_profile("Alan", ["SQL"]))
+    match_store._upsert([
+        (profile, opp, "hash", "skills", "certs", 1.0, 0.0, 0.0, time.time())
+        for profile in ["ada", "alan"] for opp in ["alpha", "beta"]
+    ])
+
+    store.opportunities.delete("alpha")
+    store.profiles.delete("alan")
+
+    rows = store.connection().execute("SELECT profile_key, opportunity_key FROM match_results").fetchall()
+    assert rows == [("ada", "beta")]
@@ -0,0 +1,81 @@
+import time
+import threading
+
+import pytest
+
+from utils import resources, suggestion_generator
+from utils.suggestion_generator import generate_match_suggestions
+
+
+class FakeChain:
+    def __init__(self, latency: float = 0.05, fail_for: str = None):
+        self.latency = latency
+        self.fail_for = fail_for
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, inputs):
+        with self._lock:
+            self.calls.append(inputs["opp_title"])
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.latency)
+            if inputs["opp_title"] == self.fail_for:
+                raise RuntimeError("model crashed")
+            return f"advice for {inputs['opp_title']}"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def chain():
+    fake = FakeChain()
+    resources.override("suggestion_chain", fake)
+    suggestion_generator._suggestion_cache.clear()
+    yield fake
+    resources.reset("suggestion_chain")
+    suggestion_generator._suggestion_cache.clear()
+
+
+STUDENT = {"objective": "Learn", "skills": ["Python"], "certifications": []}
+OPPORTUNITIES = [
+    {"title": f"Role {i}", "required_skills": ["python"], "match_score": score}
+    for i, score in enumerate([0.62, 0.91, 0.75, 0.88, 0.70])
+]
+
+
+def test_suggestions_follow_match_score_order(chain):
+    results = generate_match_suggestions(STUDENT, OPPORTUNITIES, top_k=3, max_concurrency=3)
+    assert [opp["title"] for opp, _ in results] == ["Role 1", "Role 3", "Role 2"]
+    assert [text for _, text in results] == ["advice for Role 1", "advice for Role 3", "advice for Role 2"]
+    assert sorted(chain.calls) == ["Role 1", "Role 2", "Role 3"]
+
+
+def test_concurrency_is_bounded(chain):
+    generate_match_suggestions(STUDENT, OPPORTUNITIES, top_k=5, max_concurrency=2)
+    assert len(chain.calls) == 5
+    assert chain.max_active == 2
+
+
+def test_serial_when_concurrency_is_one(chain):
+    generate_match_suggestions(STUDENT, OPPORTUNITIES, top_k=3, max_concurrency=1)
+    assert chain.max_active == 1
+
+
+def test_failures_stay_with_their_match(chain):
+    chain.fail_for = "Role 3"
+    results = dict((opp["title"], text) for opp, text in
+                   generate_match_suggestions(STUDENT, OPPORTUNITIES, top_k=3, max_concurrency=3))
+    assert results["Role 3"].startswith("⚠️ Error generating suggestions: model crashed")
+    assert results["Role 1"] == "advice for Role 1"
+    assert results["Role 2"] == "advice for Role 2"
+
+
+def test_repeated_requests_reuse_cached_advice(chain):
+    generate_match_suggestions(STUDENT, OPPORTUNITIES, top_k=3)
+    generate_match_suggestions(STUDENT, OPPORTUNITIES, top_k=3)
+    assert len(chain.calls) == 3
@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Set
+
+from azure.core.credentials import AzureKeyCredential
+from azure.ai.documentintelligence.aio import DocumentIntelligenceClient as AsyncDocumentIntelligenceClient
+from azure.ai.textanalytics.aio import TextAnalyticsClient as AsyncTextAnalyticsClient
+
+from utils import form_recognizer, entity_extractor, tracing
+from utils.form_recognizer import (
+    parse_resume_fast_path,
+    profile_from_analyze_result,
+    get_cached_profile,
+    cache_profile,
+    azure_parser,
+    LOCAL_PARSER
+)
+from utils.entity_extractor import (
+    normalize_keywords,
+    process_raw_skills,
+    resume_section_texts,
+    plan_entity_batches,
+    merge_entity_batches,
+    skills_from_entities,
+    extract_entities_local,
+    entities_from_results,
+)
+from utils.smart_matcher import score_opportunities, rank_matches, matched_opportunities, embed_list
+from utils.suggestion_generator import generate_suggestions
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STAGE_TIMEOUTS = {
+    "parse": 60.0,
+    "load": 60.0,
+    "extract": 30.0,
+    "score": 60.0,
+    "suggest": 120.0,
+}
+
+
+class PipelineStageTimeout(Exception):
+    pass
+
+
+# A timed-out stage is cancelled at its current await, so it starts no further
+# remote calls and no later stage runs. Work already handed to a thread with
+# asyncio.to_thread cannot be interrupted; it finishes in the background and
+# its result is discarded.
+async def _run_stage(name: str, coro, timeouts: Dict[str, float]):
+    try:
+        with tracing.span(f"stage.{name}"):
+            return await asyncio.wait_for(coro, timeout=timeouts.get(name))
+    except asyncio.TimeoutError:
+        raise PipelineStageTimeout(f"Stage '{name}' did not finish within {timeouts.get(name)}s.")
+
+
+@tracing.traced("document_intelligence.analyze")
+async def _analyze_document_async(client, document_data: bytes) -> dict:
+    tracing.increment("remote_calls", service="document_intelligence")
+    poller = await client.begin_analyze_document(
+        model_id=form_recognizer.AZURE_CUSTOM_MODEL_ID,
+        body=document_data,
+        content_type="application/pdf"
+    )
+    return profile_from_analyze_result(await poller.result())
+
+
+async def parse_resume_async(document_data: bytes, document_client=None) -> dict:
+    cached = get_cached_profile(document_data)
+    if cached is not None:
+        return cached
+
+    parser = LOCAL_PARSER
+    profile = await asyncio.to_thread(parse_resume_fast_path, document_data)
+    if profile is None:
+        parser = azure_parser()
+        if document_client is not None:
+            profile = await _analyze_document_async(document_client, document_data)
+        else:
+            if not form_recognizer.AZURE_ENDPOINT or not form_recognizer.AZURE_KEY:
+                raise ValueError("Azure credentials not found. Please check .env file.")
+            async with AsyncDocumentIntelligenceClient(
+                endpoint=form_recognizer.AZURE_ENDPOINT,
+                credential=AzureKeyCredential(form_recognizer.AZURE_KEY)
+            ) as client:
+                profile = await _analyze_document_async(client, document_data)
+
+    cache_profile(document_data, parser, profile)
+    return profile
+
+
+async def extract_entities_async(texts: List[str], text_client=None,
+                                 max_concurrency: int = entity_extractor.TEXT_ANALYTICS_MAX_CONCURRENCY) -> List[List[str]]:
+    batches, owners = plan_entity_batches(texts)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def recognize(client, batch):
+        async with semaphore:
+            tracing.increment("remote_calls", service="text_analytics")
+            try:
+                with tracing.span("text_analytics.recognize", documents=len(batch)):
+                    return entities_from_results(await client.recognize_entities(documents=batch))
+            except Exception as e:
+                logger.warning("Entity recognition batch failed: %s", e)
+                return [[] for _ in batch]
+
+    async def recognize_all(client):
+        return await asyncio.gather(*(recognize(client, batch) for batch in batches))
+
+    if text_client is not None:
+        batch_results = await recognize_all(text_client)
+    else:
+        if not entity_extractor.AZURE_TEXT_ANALYTICS_ENDPOINT or not entity_extractor.AZURE_TEXT_ANALYTICS_KEY:
+            raise ValueError("Azure Text Analytics credentials not found. Check .env file.")
+        async with AsyncTextAnalyticsClient(
+            endpoint=entity_extractor.AZURE_TEXT_ANALYTICS_ENDPOINT,
+            credential=AzureKeyCredential(entity_extractor.AZURE_TEXT_ANALYTICS_KEY)
+        ) as client:
+            batch_results = await recognize_all(client)
+    return merge_entity_batches(len(texts), owners, batch_results)
+
+
+async def extract_resume_skills_async(resume: dict, text_client=None) -> List[str]:
+    texts = [text.replace("\n", " ") for text in resume_section_texts(resume)]
+    if entity_extractor.SKILL_EXTRACTION_BACKEND == "local":
+        ner_entities = await asyncio.to_thread(extract_entities_local, texts)
+    else:
+        ner_entities = await extract_entities_async(texts, text_client)
+    raw_skills = process_raw_skills(resume.get("skills", []))
+    section_skills = await asyncio.to_thread(skills_from_entities, texts, ner_entities)
+    return normalize_keywords(list(set(raw_skills).union(*section_skills)))
+
+
+async def run_resume_pipeline(document_data: bytes, load_opportunities: Callable[[], Dict[str, dict]],
+                              threshold: float = 0.60, timeouts: Optional[Dict[str, float]] = None,
+                              mode: str = "serial", suggest: bool = True, text_client=None,
+                              document_client=None, scorer: Optional[Callable[[dict, Dict[str, dict]], dict]] = None) -> dict:
+    with tracing.trace("resume_upload") as root:
+        result = await _run_resume_pipeline(
+            document_data, load_opportunities, threshold, timeouts, mode, suggest, text_client, document_client, scorer
+        )
+    result["trace"] = root.to_dict() if root is not None else None
+    return result
+
+
+async def _run_resume_pipeline(document_data: bytes, load_opportunities: Callable[[], Dict[str, dict]],
+                               threshold: float, timeouts: Optional[Dict[str, float]], mode: str,
+                               suggest: bool, text_client, document_client, scorer) -> dict:
+    timeouts = {**DEFAULT_STAGE_TIMEOUTS, **(timeouts or {})}
+    opportunities_task = asyncio.create_task(asyncio.to_thread(load_opportunities))
+    cert_task = None
+    try:
+        profile = await _run_stage("parse", parse_resume_async(document_data, document_client), timeouts)
+        result = {"profile": profile, "extracted_skills": [], "matches": [], "top_opportunities": [], "suggestions": ""}
+        if not any(profile.values()) or "error" in profile:
+            return result
+
+        cert_task = asyncio.create_task(asyncio.to_thread(embed_list, profile.get("certifications", [])))
+        student_json = dict(profile)
+        student_json["extracted_skills"] = await _run_stage(
+            "extract", extract_resume_skills_async(profile, text_client), timeouts
+        )
+
+        result["extracted_skills"] = student_json["extracted_skills"]
+
+        opportunities, _ = await _run_stage("load", asyncio.gather(opportunities_task, cert_task), timeouts)
+        if scorer is not None:
+            scoring = asyncio.to_thread(scorer, student_json, opportunities)
+        else:
+            scoring = asyncio.to_thread(score_opportunities, student_json, opportunities, mode, threshold=threshold)
+        scores = await _run_stage("score", scoring, timeouts)
+        result["matches"] = rank_matches(scores, threshold)
+        result["top_opportunities"] = matched_opportunities(result["matches"], opportunities)
+        if suggest:
+            result["suggestions"] = await _run_stage(
+                "suggest", asyncio.to_thread(generate_suggestions, profile, result["top_opportunities"]), timeouts
+            )
+        return result
+    finally:
+        opportunities_task.cancel()
+        if cert_task is not None:
+            cert_task.cancel()
+
+
+class ResumePipelineRunner:
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="resume-pipeline", daemon=True)
+        self._thread.start()
+        self._lock = threading.Lock()
+        self._pending: Set[Future] = set()
+
+    def submit(self, document_data: bytes, load_opportunities: Callable[[], Dict[str, dict]], **kwargs) -> Future:
+        future = asyncio.run_coroutine_threadsafe(
+            run_resume_pipeline(document_data, load_opportunities, **kwargs), self._loop
+        )
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def _discard(self, future: Future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def close(self):
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            future.cancel()
+        self._loop.call_soon_threadsafe(self._loop.stop)
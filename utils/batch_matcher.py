@@ -0,0 +1,191 @@
+import os
+import csv
+import sys
+import json
+import hashlib
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Set
+
+from utils.entity_extractor import normalize_keywords, extract_skills_from_resume
+from utils.form_recognizer import extract_student_profile_from_pdf
+from utils.smart_matcher import load_opportunities, score_opportunities, rank_matches
+
+logger = logging.getLogger(__name__)
+
+CSV_FIELDS = ["resume", "opportunity", "score", "overlap_score", "fuzzy_score", "cert_score"]
+
+_worker_opportunities: Dict[str, dict] = {}
+
+
+def _init_worker(opportunities: Dict[str, dict]):
+    global _worker_opportunities
+    _worker_opportunities = opportunities
+
+
+def load_profile(path: str) -> dict:
+    if path.lower().endswith(".pdf"):
+        profile = extract_student_profile_from_pdf(path)
+        if "error" in profile:
+            raise ValueError(profile["error"])
+        return profile
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def match_resume(path: str, threshold: float) -> List[Dict[str, any]]:
+    student_json = load_profile(path)
+    student_json["extracted_skills"] = normalize_keywords(extract_skills_from_resume(student_json))
+    return rank_matches(score_opportunities(student_json, _worker_opportunities, threshold=threshold), threshold)
+
+
+def hash_resumes(resume_dir: str) -> Dict[str, str]:
+    digests = {}
+    for filename in sorted(os.listdir(resume_dir)):
+        if not filename.lower().endswith((".pdf", ".json")):
+            continue
+        with open(os.path.join(resume_dir, filename), "rb") as f:
+            digests[filename] = hashlib.sha256(f.read()).hexdigest()
+    return digests
+
+
+def group_resumes(digests: Dict[str, str], done: Dict[str, str]) -> Dict[str, List[str]]:
+    groups: Dict[str, List[str]] = {}
+    for filename, digest in digests.items():
+        if done.get(filename) != digest:
+            groups.setdefault(digest, []).append(filename)
+    return groups
+
+
+def read_checkpoint(path: str) -> Dict[str, str]:
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, "r") as f:
+        for line in f:
+            name, _, digest = line.rstrip("\n").rpartition("\t")
+            if name and digest:
+                done[name] = digest
+    return done
+
+
+def _completed_rows(path: str, output_format: str, completed: Set[str]) -> List[dict]:
+    with open(path, "r", newline="") as f:
+        if output_format == "csv":
+            return [row for row in csv.DictReader(f) if row.get("resume") in completed]
+        rows = []
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if row.get("resume") in completed:
+                rows.append(row)
+    return rows
+
+
+def recover_output(path: str, output_format: str, completed: Set[str]):
+    if not os.path.exists(path):
+        return
+    rows = _completed_rows(path, output_format, completed)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", newline="") as f:
+        if output_format == "csv":
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+    os.replace(tmp_path, path)
+
+
+class ResultWriter:
+    def __init__(self, path: str, output_format: str):
+        self.output_format = output_format
+        write_header = output_format == "csv" and not os.path.exists(path)
+        self._file = open(path, "a", newline="")
+        if output_format == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=CSV_FIELDS)
+            if write_header:
+                self._csv.writeheader()
+
+    def write(self, resume: str, matches: List[Dict[str, any]]):
+        if self.output_format == "csv":
+            for match in matches:
+                details = match["details"]
+                self._csv.writerow({
+                    "resume": resume,
+                    "opportunity": match["file"],
+                    "score": match["score"],
+                    "overlap_score": details["overlap_score"],
+                    "fuzzy_score": details["fuzzy_score"],
+                    "cert_score": details["cert_score"],
+                })
+        else:
+            self._file.write(json.dumps({"resume": resume, "matches": matches}) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def run_batch(resume_dir: str, opportunity_dir: str, output_path: str, output_format: str = "jsonl",
+              checkpoint_path: str = None, workers: int = os.cpu_count() or 1, threshold: float = 0.60) -> Dict[str, int]:
+    checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+    done = read_checkpoint(checkpoint_path)
+    digests = hash_resumes(resume_dir)
+    groups = group_resumes(digests, done)
+    completed = {name for name, digest in digests.items() if done.get(name) == digest}
+    recover_output(output_path, output_format, completed)
+    opportunities = load_opportunities(opportunity_dir, mode="thread")
+
+    stats = {"skipped": len(completed), "scored": 0, "failed": 0}
+    writer = ResultWriter(output_path, output_format)
+    try:
+        with open(checkpoint_path, "a") as checkpoint, ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(opportunities,)
+        ) as executor:
+            futures = {
+                executor.submit(match_resume, os.path.join(resume_dir, names[0]), threshold): (digest, names)
+                for digest, names in groups.items()
+            }
+            for future in as_completed(futures):
+                digest, names = futures[future]
+                try:
+                    matches = future.result()
+                except Exception as e:
+                    logger.warning("Failed to match %s: %s", names[0], e)
+                    stats["failed"] += len(names)
+                    continue
+                for name in names:
+                    writer.write(name, matches)
+                for name in names:
+                    checkpoint.write(f"{name}\t{digest}\n")
+                checkpoint.flush()
+                stats["scored"] += len(names)
+    finally:
+        writer.close()
+    return stats
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Score a directory of resumes against all opportunities.")
+    parser.add_argument("--resumes", required=True, help="Directory of resume PDFs or parsed profile JSONs")
+    parser.add_argument("--opportunities", default="data/json/opportunities", help="Directory of opportunity JSONs")
+    parser.add_argument("--output", required=True, help="Results file (appended to when resuming)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--checkpoint", help="Checkpoint file (defaults to <output>.checkpoint)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threshold", type=float, default=0.60)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    stats = run_batch(args.resumes, args.opportunities, args.output, args.format,
+                      args.checkpoint, args.workers, args.threshold)
+    print(json.dumps(stats))
+    return 0 if stats["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import os
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List, Dict
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "data/cache/embeddings")
+EMBEDDING_CACHE_MEMORY_SIZE = int(os.getenv("EMBEDDING_CACHE_MEMORY_SIZE", "4096"))
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def to_cache_precision(vector: np.ndarray) -> np.ndarray:
+    return np.asarray(vector, dtype=np.float16).astype(np.float32)
+
+
+class EmbeddingCache:
+    def __init__(self, model_name: str, cache_dir: str = EMBEDDING_CACHE_DIR,
+                 memory_size: int = EMBEDDING_CACHE_MEMORY_SIZE):
+        self.model_name = model_name
+        self.memory_size = memory_size
+        slug = re.sub(r"[^\w.-]", "_", model_name)
+        self.vectors_path = os.path.join(cache_dir, f"{slug}.f16")
+        self.index_path = os.path.join(cache_dir, f"{slug}.index.json")
+        self._lock_path = os.path.join(cache_dir, f"{slug}.lock")
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._dim = None
+        self._index_mtime = None
+        self._vectors = None
+
+    def key(self, text: str) -> str:
+        payload = f"{self.model_name}\0{normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def _file_lock(self):
+        os.makedirs(os.path.dirname(self._lock_path) or ".", exist_ok=True)
+        with open(self._lock_path, "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _refresh_index(self):
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._index_mtime:
+            return
+        with open(self.index_path, "r") as f:
+            meta = json.load(f)
+        self._rows = meta["rows"]
+        self._dim = meta["dim"]
+        self._index_mtime = mtime
+        self._vectors = None
+
+    def _disk_vectors(self) -> np.ndarray:
+        if self._vectors is None and self._rows:
+            row_count = os.path.getsize(self.vectors_path) // (self._dim * 2)
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float16, mode="r", shape=(row_count, self._dim))
+        return self._vectors
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                else:
+                    missing.append(key)
+            if not missing:
+                return found
+
+            self._refresh_index()
+            vectors = self._disk_vectors()
+            for key in missing:
+                row = self._rows.get(key)
+                if row is not None and vectors is not None and row < vectors.shape[0]:
+                    found[key] = np.asarray(vectors[row], dtype=np.float32)
+                    self._remember(key, found[key])
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, to_cache_precision(vector))
+
+            with self._file_lock():
+                self._index_mtime = None
+                self._refresh_index()
+                new_items = {key: vector for key, vector in items.items() if key not in self._rows}
+                if not new_items:
+                    return
+
+                dim = self._dim or len(next(iter(new_items.values())))
+                with open(self.vectors_path, "ab") as f:
+                    start_row = f.tell() // (dim * 2)
+                    block = np.stack([np.asarray(v, dtype=np.float16) for v in new_items.values()])
+                    f.write(block.tobytes())
+                for offset, key in enumerate(new_items):
+                    self._rows[key] = start_row + offset
+                self._dim = dim
+
+                tmp_path = f"{self.index_path}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump({"model": self.model_name, "dim": dim, "rows": self._rows}, f)
+                os.replace(tmp_path, self.index_path)
+                self._index_mtime = os.stat(self.index_path).st_mtime_ns
+                self._vectors = None
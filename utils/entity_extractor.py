@@ -1,25 +1,54 @@
 import os
 import re
+import json
 import spacy
-from typing import List
+import hashlib
+import threading
+from spacy.matcher import PhraseMatcher
+from collections import OrderedDict
+from typing import List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from azure.ai.textanalytics import TextAnalyticsClient
 from azure.core.credentials import AzureKeyCredential
+from utils.gazetteer import SkillGazetteer, load_phrases
+from utils import resources, tracing
 
 load_dotenv()
 
 AZURE_TEXT_ANALYTICS_ENDPOINT = os.getenv("AZURE_TEXT_ANALYTICS_ENDPOINT")
 AZURE_TEXT_ANALYTICS_KEY = os.getenv("AZURE_TEXT_ANALYTICS_KEY")
+KNOWN_SKILLS_FILE = os.getenv("KNOWN_SKILLS_FILE")
+SKILL_EXTRACTION_BACKEND = os.getenv("SKILL_EXTRACTION_BACKEND", "azure")
+EXTRACTION_BACKENDS = ("azure", "local")
+TEXT_ANALYTICS_MAX_DOCUMENTS = 5
+TEXT_ANALYTICS_MAX_CHARACTERS = 5120
+TEXT_ANALYTICS_MAX_CONCURRENCY = int(os.getenv("TEXT_ANALYTICS_MAX_CONCURRENCY", "4"))
+ALLOWED_ENTITY_CATEGORIES = {"Skill", "Product", "Organization", "Event", "Other"}
+REJECTED_POS_TAGS = {"VERB", "ADJ", "ADV", "NUM", "PRON"}
+ENTITY_FILTER_CACHE_SIZE = int(os.getenv("ENTITY_FILTER_CACHE_SIZE", "10000"))
+SPACY_BATCH_SIZE = 256
 
-if not AZURE_TEXT_ANALYTICS_ENDPOINT or not AZURE_TEXT_ANALYTICS_KEY:
-    raise ValueError("Azure Text Analytics credentials not found. Check .env file.")
+if SKILL_EXTRACTION_BACKEND not in EXTRACTION_BACKENDS:
+    raise ValueError(f"Unknown SKILL_EXTRACTION_BACKEND '{SKILL_EXTRACTION_BACKEND}'. Expected one of {EXTRACTION_BACKENDS}.")
 
-client = TextAnalyticsClient(
-    endpoint=AZURE_TEXT_ANALYTICS_ENDPOINT,
-    credential=AzureKeyCredential(AZURE_TEXT_ANALYTICS_KEY)
-)
+def _load_text_analytics_client() -> TextAnalyticsClient:
+    if not AZURE_TEXT_ANALYTICS_ENDPOINT or not AZURE_TEXT_ANALYTICS_KEY:
+        raise ValueError("Azure Text Analytics credentials not found. Check .env file.")
+    return TextAnalyticsClient(
+        endpoint=AZURE_TEXT_ANALYTICS_ENDPOINT,
+        credential=AzureKeyCredential(AZURE_TEXT_ANALYTICS_KEY)
+    )
 
-nlp = spacy.load("en_core_web_sm")
+def _load_nlp():
+    return spacy.load("en_core_web_sm", exclude=["parser", "ner", "lemmatizer", "senter"])
+
+resources.register("text_analytics_client", _load_text_analytics_client)
+resources.register("spacy_nlp", _load_nlp)
+
+_entity_filter_cache = OrderedDict()
+_entity_filter_lock = threading.Lock()
+_extractor_fingerprints: Dict[str, str] = {}
 
 KNOWN_SKILLS = {
     "python", "c++", "sql", "flask", "tensorflow", "postgresql", "sqlite", "langchain", "mongodb", "node.js",
@@ -61,6 +90,46 @@ NORMALIZATION_MAP = {
     "natural language processing": "nlp"
 }
 
+def _load_local_nlp():
+    return spacy.blank("en")
+
+def build_local_skill_matcher() -> PhraseMatcher:
+    nlp = resources.get("local_nlp")
+    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+    phrases = sorted(set(KNOWN_SKILLS) | set(NORMALIZATION_MAP))
+    matcher.add("SKILL", list(nlp.tokenizer.pipe(phrases)))
+    return matcher
+
+def _load_skill_gazetteer() -> SkillGazetteer:
+    return SkillGazetteer(KNOWN_SKILLS)
+
+resources.register("local_nlp", _load_local_nlp)
+resources.register("local_skill_matcher", build_local_skill_matcher)
+resources.register("skill_gazetteer", _load_skill_gazetteer)
+
+def load_known_skills(path: str) -> int:
+    skills = load_phrases(path)
+    KNOWN_SKILLS.clear()
+    KNOWN_SKILLS.update(skills)
+    resources.reset("skill_gazetteer")
+    resources.reset("local_skill_matcher")
+    _extractor_fingerprints.clear()
+    return len(KNOWN_SKILLS)
+
+if KNOWN_SKILLS_FILE:
+    load_known_skills(KNOWN_SKILLS_FILE)
+
+def extractor_fingerprint(backend: str = None) -> str:
+    backend = backend or SKILL_EXTRACTION_BACKEND
+    if backend not in _extractor_fingerprints:
+        vocabulary = json.dumps([sorted(KNOWN_SKILLS), sorted(NORMALIZATION_MAP.items())], ensure_ascii=False)
+        digest = hashlib.sha256(vocabulary.encode("utf-8")).hexdigest()[:16]
+        _extractor_fingerprints[backend] = f"{backend}:{digest}"
+    return _extractor_fingerprints[backend]
+
+if KNOWN_SKILLS_FILE:
+    load_known_skills(KNOWN_SKILLS_FILE)
+
 def normalize_keywords(keywords: List[str]) -> List[str]:
     normalized = set()
     for kw in keywords:
@@ -83,58 +152,147 @@ def process_raw_skills(raw_skills: List[str]) -> List[str]:
         all_skills.extend(skills)
     return list(set(normalize_keywords(all_skills)))
 
-def extract_entities(text: str) -> List[str]:
-    if not text.strip():
-        return []
+def chunk_text(text: str, limit: int = TEXT_ANALYTICS_MAX_CHARACTERS) -> List[str]:
+    chunks = []
+    text = text.strip()
+    while len(text) > limit:
+        split_at = text.rfind(" ", 0, limit + 1)
+        if split_at <= 0:
+            split_at = limit
+        chunks.append(text[:split_at].strip())
+        text = text[split_at:].strip()
+    if text:
+        chunks.append(text)
+    return chunks
+
+def entities_from_results(results) -> List[List[str]]:
+    return [
+        [] if result.is_error else
+        [ent.text.strip() for ent in result.entities if ent.category in ALLOWED_ENTITY_CATEGORIES]
+        for result in results
+    ]
+
+def _recognize_batch(text_client, documents: List[str]) -> List[List[str]]:
+    tracing.increment("remote_calls", service="text_analytics")
     try:
-        result = client.recognize_entities(documents=[text])[0]
-        if result.is_error:
-            return []
-        allowed_categories = {"Skill", "Product", "Organization", "Event", "Other"}
-        return list({ent.text.strip() for ent in result.entities if ent.category in allowed_categories})
+        with tracing.span("text_analytics.recognize", documents=len(documents)):
+            return entities_from_results(text_client.recognize_entities(documents=documents))
     except Exception as e:
-        return []
+        return [[] for _ in documents]
 
-def manual_match_known_skills_from_text(text: str) -> List[str]:
-    text = text.lower()
-    matches = []
-    for skill in KNOWN_SKILLS:
-        if skill.lower() in text:
-            matches.append(skill)
-    return list(set(normalize_keywords(matches)))
+@tracing.traced("ner.local")
+def extract_entities_local(texts: List[str]) -> List[List[str]]:
+    entities = []
+    nlp = resources.get("local_nlp")
+    matcher = resources.get("local_skill_matcher")
+    for doc in nlp.tokenizer.pipe(texts, batch_size=SPACY_BATCH_SIZE):
+        entities.append(list({doc[start:end].text for _, start, end in matcher(doc)}))
+    return entities
 
-def extract_valid_skill_entities(text: str) -> List[str]:
-    text = text.replace("\n", " ")
-    ner_entities = extract_entities(text)
-    ner_normalized = [
-        normalize_keywords([ent])[0]
-        for ent in ner_entities
-        if not any(tok.pos_ in {"VERB", "ADJ", "ADV", "NUM", "PRON"} for tok in nlp(ent))
+def plan_entity_batches(texts: List[str]) -> Tuple[List[List[str]], List[int]]:
+    chunks, owners = [], []
+    for i, text in enumerate(texts):
+        for chunk in chunk_text(text):
+            chunks.append(chunk)
+            owners.append(i)
+    batches = [
+        chunks[start:start + TEXT_ANALYTICS_MAX_DOCUMENTS]
+        for start in range(0, len(chunks), TEXT_ANALYTICS_MAX_DOCUMENTS)
     ]
+    return batches, owners
+
+def merge_entity_batches(text_count: int, owners: List[int], batch_results: List[List[List[str]]]) -> List[List[str]]:
+    entities = [set() for _ in range(text_count)]
+    chunk_entities = [ents for result in batch_results for ents in result]
+    for owner, ents in zip(owners, chunk_entities):
+        entities[owner].update(ents)
+    return [list(ents) for ents in entities]
+
+def extract_entities_batch(texts: List[str], text_client=None,
+                           max_concurrency: int = TEXT_ANALYTICS_MAX_CONCURRENCY) -> List[List[str]]:
+    text_client = text_client or resources.get("text_analytics_client")
+    batches, owners = plan_entity_batches(texts)
+    if len(batches) <= 1 or max_concurrency <= 1:
+        batch_results = [_recognize_batch(text_client, batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as executor:
+            recognize = tracing.bind(lambda batch: _recognize_batch(text_client, batch))
+            batch_results = list(executor.map(recognize, batches))
+    return merge_entity_batches(len(texts), owners, batch_results)
+
+def extract_entities(text: str) -> List[str]:
+    return extract_entities_batch([text])[0]
+
+def manual_match_known_skills_from_text(text: str) -> List[str]:
+    return list(set(normalize_keywords(resources.get("skill_gazetteer").find_all(text))))
+
+def filter_entities_by_pos(entities: List[str]) -> Dict[str, bool]:
+    keys = {ent: " ".join(ent.split()) for ent in entities}
+    decisions = {}
+    with _entity_filter_lock:
+        for key in set(keys.values()):
+            if key in _entity_filter_cache:
+                _entity_filter_cache.move_to_end(key)
+                decisions[key] = _entity_filter_cache[key]
+
+    pending = [key for key in dict.fromkeys(keys.values()) if key not in decisions]
+    tracing.increment("cache_lookups", len(decisions), cache="entity_filter", result="hit")
+    tracing.increment("cache_lookups", len(pending), cache="entity_filter", result="miss")
+    if pending:
+        with tracing.span("spacy.pos_filter", entities=len(pending)):
+            for key, doc in zip(pending, resources.get("spacy_nlp").pipe(pending, batch_size=SPACY_BATCH_SIZE)):
+                decisions[key] = not any(tok.pos_ in REJECTED_POS_TAGS for tok in doc)
+        with _entity_filter_lock:
+            for key in pending:
+                _entity_filter_cache[key] = decisions[key]
+            while len(_entity_filter_cache) > ENTITY_FILTER_CACHE_SIZE:
+                _entity_filter_cache.popitem(last=False)
+
+    return {ent: decisions[key] for ent, key in keys.items()}
+
+def _filter_skill_entities(ner_entities: List[str], text: str, keep: Dict[str, bool]) -> List[str]:
+    ner_normalized = [normalize_keywords([ent])[0] for ent in ner_entities if keep[ent]]
     ner_filtered = {kw for kw in ner_normalized if kw in KNOWN_SKILLS}
     manual_matches = set(manual_match_known_skills_from_text(text))
     return list(ner_filtered.union(manual_matches))
 
-def extract_skills_from_resume(resume: dict) -> List[str]:
-    raw_skill_lines = resume.get("skills", [])
-    raw_skills = process_raw_skills(raw_skill_lines)
-    projects_text = " ".join(resume.get("projects", []))
-    experience_text = " ".join(resume.get("experience", []))
-    certs_text = " ".join(resume.get("certifications", []))
-    skills_from_projects = extract_valid_skill_entities(projects_text)
-    skills_from_experience = extract_valid_skill_entities(experience_text)
-    skills_from_certs = extract_valid_skill_entities(certs_text)
-    all_skills = set(raw_skills + skills_from_projects + skills_from_experience + skills_from_certs)
+def skills_from_entities(texts: List[str], ner_entities: List[List[str]]) -> List[List[str]]:
+    keep = filter_entities_by_pos([ent for ents in ner_entities for ent in ents])
+    return [_filter_skill_entities(ents, text, keep) for ents, text in zip(ner_entities, texts)]
+
+def extract_valid_skill_entities_batch(texts: List[str], text_client=None, backend: str = None) -> List[List[str]]:
+    texts = [text.replace("\n", " ") for text in texts]
+    if (backend or SKILL_EXTRACTION_BACKEND) == "local":
+        ner_entities = extract_entities_local(texts)
+    else:
+        ner_entities = extract_entities_batch(texts, text_client=text_client)
+    return skills_from_entities(texts, ner_entities)
+
+def extract_valid_skill_entities(text: str) -> List[str]:
+    return extract_valid_skill_entities_batch([text])[0]
+
+def resume_section_texts(resume: dict) -> List[str]:
+    return [
+        " ".join(resume.get("projects", [])),
+        " ".join(resume.get("experience", [])),
+        " ".join(resume.get("certifications", [])),
+    ]
+
+def opportunity_section_texts(opp: dict) -> List[str]:
+    return [
+        opp.get("description", ""),
+        opp.get("role", ""),
+        " ".join(opp.get("mandatory_certifications", [])),
+    ]
+
+def extract_skills_from_resume(resume: dict, text_client=None, backend: str = None) -> List[str]:
+    raw_skills = process_raw_skills(resume.get("skills", []))
+    section_skills = extract_valid_skill_entities_batch(resume_section_texts(resume), text_client, backend)
+    all_skills = set(raw_skills).union(*section_skills)
     return list(all_skills)
 
-def extract_skills_from_opportunity(opp: dict) -> List[str]:
+def extract_skills_from_opportunity(opp: dict, text_client=None, backend: str = None) -> List[str]:
     raw_skills = process_raw_skills(opp.get("required_skills", []))
-    desc_text = opp.get("description", "")
-    role_text = opp.get("role", "")
-    certs_text = " ".join(opp.get("mandatory_certifications", []))
-    skills_from_desc = extract_valid_skill_entities(desc_text)
-    skills_from_role = extract_valid_skill_entities(role_text)
-    skills_from_certs = extract_valid_skill_entities(certs_text)
-    all_skills = set(raw_skills + skills_from_desc + skills_from_role + skills_from_certs)
+    section_skills = extract_valid_skill_entities_batch(opportunity_section_texts(opp), text_client, backend)
+    all_skills = set(raw_skills).union(*section_skills)
     return list(all_skills)
-
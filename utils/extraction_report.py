@@ -0,0 +1,48 @@
+import os
+import sys
+import json
+from typing import Dict, List
+
+from utils.entity_extractor import extract_skills_from_resume, extract_skills_from_opportunity
+
+
+def compare_skill_sets(azure_skills: List[str], local_skills: List[str]) -> Dict[str, any]:
+    azure_set, local_set = set(azure_skills), set(local_skills)
+    union = azure_set | local_set
+    return {
+        "identical": azure_set == local_set,
+        "jaccard": round(len(azure_set & local_set) / len(union), 3) if union else 1.0,
+        "only_azure": sorted(azure_set - local_set),
+        "only_local": sorted(local_set - azure_set),
+    }
+
+
+def build_equivalence_report(resumes_dir: str, opportunities_dir: str) -> Dict[str, any]:
+    sources = [
+        ("resume", resumes_dir, extract_skills_from_resume),
+        ("opportunity", opportunities_dir, extract_skills_from_opportunity),
+    ]
+    documents = []
+    for kind, directory, extract in sources:
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".json"):
+                continue
+            with open(os.path.join(directory, filename), "r") as f:
+                doc = json.load(f)
+            comparison = compare_skill_sets(extract(doc, backend="azure"), extract(doc, backend="local"))
+            documents.append({"kind": kind, "file": filename, **comparison})
+
+    return {
+        "documents": len(documents),
+        "identical": sum(d["identical"] for d in documents),
+        "mean_jaccard": round(sum(d["jaccard"] for d in documents) / len(documents), 3) if documents else 1.0,
+        "details": documents,
+    }
+
+
+if __name__ == "__main__":
+    resumes_dir = sys.argv[1] if len(sys.argv) > 1 else "data/json/resumes"
+    opportunities_dir = sys.argv[2] if len(sys.argv) > 2 else "data/json/opportunities"
+    print(json.dumps(build_equivalence_report(resumes_dir, opportunities_dir), indent=2))
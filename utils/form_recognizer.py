@@ -1,21 +1,36 @@
 import os
+import logging
+from typing import List, Optional, Tuple
 from dotenv import load_dotenv
 from azure.core.credentials import AzureKeyCredential
 from azure.ai.documentintelligence import DocumentIntelligenceClient 
+from utils import resources, tracing
+from utils.parse_cache import ParseCache, parse_cache_key
+from utils.local_parser import parse_resume_locally, LOCAL_PARSER_VERSION
 
 load_dotenv()
 
 AZURE_ENDPOINT = os.getenv("AZURE_DI_ENDPOINT")
 AZURE_KEY = os.getenv("AZURE_DI_KEY")
 AZURE_CUSTOM_MODEL_ID = os.getenv("AZURE_CUSTOM_MODEL_ID")
+RESUME_PARSER = os.getenv("RESUME_PARSER", "auto")
+LOCAL_PARSE_MIN_CONFIDENCE = float(os.getenv("LOCAL_PARSE_MIN_CONFIDENCE", "0.8"))
+AZURE_PROFILE_VERSION = "1"
+LOCAL_PARSER = ("local", LOCAL_PARSER_VERSION)
 
-if not AZURE_ENDPOINT or not AZURE_KEY:
-    raise ValueError("Azure credentials not found. Please check .env file.")
+logger = logging.getLogger(__name__)
 
-client = DocumentIntelligenceClient(
-    endpoint=AZURE_ENDPOINT,
-    credential=AzureKeyCredential(AZURE_KEY)
-)
+def _load_document_intelligence_client() -> DocumentIntelligenceClient:
+    if not AZURE_ENDPOINT or not AZURE_KEY:
+        raise ValueError("Azure credentials not found. Please check .env file.")
+    return DocumentIntelligenceClient(
+        endpoint=AZURE_ENDPOINT,
+        credential=AzureKeyCredential(AZURE_KEY)
+    )
+
+resources.register("document_intelligence_client", _load_document_intelligence_client)
+
+parse_cache = ParseCache()
 
 def split_list_field(field_value: str) -> list:
     if not field_value:
@@ -27,40 +42,94 @@ def parse_education_field(value: str) -> list:
         return []
     return [line.strip() for line in value.split("\n") if line.strip()]
 
+def profile_from_analyze_result(result) -> dict:
+    fields = result.documents[0].fields if result.documents else {}
+
+    def get_field(name):
+        return fields.get(name).content.strip() if fields.get(name) and fields.get(name).content else ""
+
+    profile = {
+        "name": get_field("Name"),
+        "email": get_field("Email"),
+        "phone": get_field("Phone"),
+        "social_links": split_list_field(get_field("SocialLinks")),
+        "objective": get_field("Objective"),
+        "certifications": split_list_field(get_field("Certifications")),
+        "skills": split_list_field(get_field("Skills")),
+        "experience": split_list_field(get_field("Experience")),
+        "projects": split_list_field(get_field("Projects")),
+    }
+
+    education_text = get_field("Education")
+    profile["education_raw"] = education_text
+    profile["education"] = parse_education_field(education_text)
+
+    return profile
+
+@tracing.traced("document_intelligence.analyze")
+def analyze_resume_document(document_data: bytes) -> dict:
+    tracing.increment("remote_calls", service="document_intelligence")
+    poller = resources.get("document_intelligence_client").begin_analyze_document(
+        model_id=AZURE_CUSTOM_MODEL_ID,
+        body=document_data,
+        content_type="application/pdf"
+    )
+    return profile_from_analyze_result(poller.result())
+
+def azure_parser() -> Tuple[str, str]:
+    return f"azure:{AZURE_CUSTOM_MODEL_ID}", AZURE_PROFILE_VERSION
+
+def enabled_parsers() -> List[Tuple[str, str]]:
+    parsers = []
+    if RESUME_PARSER != "azure":
+        parsers.append(LOCAL_PARSER)
+    if RESUME_PARSER != "local":
+        parsers.append(azure_parser())
+    return parsers
+
+def get_cached_profile(document_data: bytes) -> Optional[dict]:
+    for parser, version in enabled_parsers():
+        cached = parse_cache.get(parse_cache_key(document_data, parser, version))
+        if cached is not None:
+            tracing.increment("cache_lookups", cache="parse", result="hit")
+            return cached
+    tracing.increment("cache_lookups", cache="parse", result="miss")
+    return None
+
+def cache_profile(document_data: bytes, parser: Tuple[str, str], profile: dict):
+    if any(profile.values()):
+        parse_cache.put(parse_cache_key(document_data, *parser), profile)
+
+def parse_resume_fast_path(document_data: bytes) -> Optional[dict]:
+    if RESUME_PARSER == "azure":
+        return None
+    try:
+        with tracing.span("parse.local"):
+            profile, confidence = parse_resume_locally(document_data)
+            tracing.annotate(confidence=round(confidence, 2))
+    except Exception as e:
+        logger.warning("Local resume parse failed, falling back to Document Intelligence: %s", e)
+        return None
+    if RESUME_PARSER == "local" or confidence >= LOCAL_PARSE_MIN_CONFIDENCE:
+        return profile
+    return None
+
 def extract_student_profile_from_pdf(resume_path: str) -> dict:
     try:
         with open(resume_path, "rb") as f:
             document_data = f.read()
 
-        poller = client.begin_analyze_document(
-            model_id=AZURE_CUSTOM_MODEL_ID,
-            body=document_data,
-            content_type="application/pdf"
-        )
-
-        result = poller.result()
-        fields = result.documents[0].fields if result.documents else {}
-
-        def get_field(name):
-            return fields.get(name).content.strip() if fields.get(name) and fields.get(name).content else ""
-
-        profile = {
-            "name": get_field("Name"),
-            "email": get_field("Email"),
-            "phone": get_field("Phone"),
-            "social_links": split_list_field(get_field("SocialLinks")),
-            "objective": get_field("Objective"),
-            "certifications": split_list_field(get_field("Certifications")),
-            "skills": split_list_field(get_field("Skills")),
-            "experience": split_list_field(get_field("Experience")),
-            "projects": split_list_field(get_field("Projects")),
-        }
-
-        education_text = get_field("Education")
-        profile["education_raw"] = education_text
-        profile["education"] = parse_education_field(education_text)
+        cached = get_cached_profile(document_data)
+        if cached is not None:
+            return cached
 
+        parser = LOCAL_PARSER
+        profile = parse_resume_fast_path(document_data)
+        if profile is None:
+            parser = azure_parser()
+            profile = analyze_resume_document(document_data)
+        cache_profile(document_data, parser, profile)
         return profile
 
     except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+        return {"error": str(e)}
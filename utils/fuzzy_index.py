@@ -0,0 +1,77 @@
+import difflib
+from collections import Counter, defaultdict
+from typing import Iterable, List, Dict
+
+# Two strings with SequenceMatcher.ratio() above 2/3 always share at least one
+# boundary-padded character bigram, so bigram candidate generation is lossless
+# for any cutoff above that bound.
+EXACT_PRUNING_CUTOFF = 2 / 3
+
+
+def _padded_bigrams(text: str) -> set:
+    padded = f"\x02{text}\x03"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class FuzzySkillIndex:
+    def __init__(self, vocabulary: Iterable[str]):
+        self._term_counts = Counter(vocabulary)
+        self.vocabulary = sorted(self._term_counts)
+        self._postings = defaultdict(set)
+        for term in self.vocabulary:
+            for gram in _padded_bigrams(term):
+                self._postings[gram].add(term)
+
+    def updated(self, added: Iterable[str], removed: Iterable[str]) -> "FuzzySkillIndex":
+        added, removed = Counter(added), Counter(removed)
+        counts = self._term_counts.copy()
+        counts.update(added)
+        counts.subtract(removed)
+        new_terms = [term for term in added if term not in self._term_counts]
+        dead_terms = [term for term in removed if counts[term] <= 0]
+        for term in dead_terms:
+            del counts[term]
+
+        index = FuzzySkillIndex(())
+        index._term_counts = counts
+        index.vocabulary = sorted(counts)
+        grams = {gram for term in new_terms + dead_terms for gram in _padded_bigrams(term)}
+        index._postings = defaultdict(set, self._postings)
+        for gram in grams:
+            index._postings[gram] = set(self._postings.get(gram, ()))
+        for term in dead_terms:
+            for gram in _padded_bigrams(term):
+                index._postings[gram].discard(term)
+        for term in new_terms:
+            for gram in _padded_bigrams(term):
+                index._postings[gram].add(term)
+        for gram in grams:
+            if not index._postings[gram]:
+                del index._postings[gram]
+        return index
+
+    def candidates(self, skill: str, cutoff: float) -> List[str]:
+        if cutoff <= EXACT_PRUNING_CUTOFF:
+            return self.vocabulary
+        found = set()
+        for gram in _padded_bigrams(skill):
+            found |= self._postings.get(gram, set())
+        return [
+            term for term in found
+            if 2 * min(len(term), len(skill)) >= cutoff * (len(term) + len(skill))
+        ]
+
+    def neighbours(self, skill: str, cutoff: float = 0.8) -> List[str]:
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(skill)
+        scored = []
+        for term in self.candidates(skill, cutoff):
+            matcher.set_seq1(term)
+            if (matcher.real_quick_ratio() >= cutoff and
+                    matcher.quick_ratio() >= cutoff and
+                    matcher.ratio() >= cutoff):
+                scored.append((matcher.ratio(), term))
+        return [term for _, term in sorted(scored, reverse=True)]
+
+    def resolve(self, skills: Iterable[str], cutoff: float = 0.8) -> Dict[str, List[str]]:
+        return {skill: self.neighbours(skill, cutoff) for skill in set(skills)}
@@ -0,0 +1,65 @@
+from collections import deque
+from typing import Iterable, List, Dict
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class SkillGazetteer:
+    def __init__(self, phrases: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        self.size = 0
+        for phrase in {p.lower().strip() for p in phrases if p and p.strip()}:
+            self._add(phrase)
+            self.size += 1
+        self._build_failure_links()
+
+    def _add(self, phrase: str):
+        state = 0
+        for ch in phrase:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append(phrase)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def find_all(self, text: str) -> List[str]:
+        text = text.lower()
+        found = set()
+        state = 0
+        for end, ch in enumerate(text, start=1):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for phrase in self._output[state]:
+                start = end - len(phrase)
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(phrase[0]):
+                    continue
+                if end < len(text) and _is_word_char(text[end]) and _is_word_char(phrase[-1]):
+                    continue
+                found.add(phrase)
+        return list(found)
+
+
+def load_phrases(path: str) -> List[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
@@ -0,0 +1,95 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+OVERLAP_WEIGHT = 0.6
+FUZZY_WEIGHT = 0.3
+CERT_WEIGHT = 0.1
+ROUNDING_SLACK = 0.0005
+
+
+def _copy_postings(postings: Dict[str, set], touched: Iterable[str]) -> Dict[str, set]:
+    copied = defaultdict(set, postings)
+    for skill in touched:
+        if skill in postings:
+            copied[skill] = set(postings[skill])
+    return copied
+
+
+class SkillInvertedIndex:
+    def __init__(self, opportunities: Dict[str, dict]):
+        self.postings = defaultdict(set)
+        self.raw_postings = defaultdict(set)
+        self.skill_counts: Dict[str, int] = {}
+        self.distinct_counts: Dict[str, int] = {}
+        for key, opp_json in opportunities.items():
+            self._add(key, opp_json)
+
+    def _add(self, key: str, opp_json: dict):
+        skills = opp_json.get("extracted_skills", [])
+        self.skill_counts[key] = max(len(skills), 1)
+        self.distinct_counts[key] = len(set(skills))
+        for skill in set(map(str.lower, skills)):
+            self.postings[skill].add(key)
+        for skill in set(skills):
+            self.raw_postings[skill].add(key)
+
+    def _remove(self, key: str, opp_json: dict):
+        skills = opp_json.get("extracted_skills", [])
+        del self.skill_counts[key]
+        del self.distinct_counts[key]
+        for postings, terms in ((self.postings, set(map(str.lower, skills))), (self.raw_postings, set(skills))):
+            for term in terms:
+                postings[term].discard(key)
+                if not postings[term]:
+                    del postings[term]
+
+    def updated(self, added: Dict[str, dict], removed: Dict[str, dict]) -> "SkillInvertedIndex":
+        touched = [skill for opp_json in [*added.values(), *removed.values()]
+                   for skill in opp_json.get("extracted_skills", [])]
+        index = SkillInvertedIndex({})
+        index.postings = _copy_postings(self.postings, set(map(str.lower, touched)))
+        index.raw_postings = _copy_postings(self.raw_postings, set(touched))
+        index.skill_counts = dict(self.skill_counts)
+        index.distinct_counts = dict(self.distinct_counts)
+        for key, opp_json in removed.items():
+            index._remove(key, opp_json)
+        for key, opp_json in added.items():
+            index._add(key, opp_json)
+        return index
+
+    def keys(self) -> List[str]:
+        return sorted(self.skill_counts)
+
+    @staticmethod
+    def _posting_counts(postings: Dict[str, set], skills: Iterable[str]) -> Dict[str, int]:
+        counts = defaultdict(int)
+        for skill in set(skills):
+            for key in postings.get(skill, ()):
+                counts[key] += 1
+        return counts
+
+    def upper_bounds(self, student_skills: List[str], fuzzy_neighbours: Dict[str, List[str]]) -> Dict[str, float]:
+        exact_counts = self._posting_counts(self.postings, map(str.lower, student_skills))
+        fuzzy_counts = self._posting_counts(
+            self.raw_postings, (n for neighbours in fuzzy_neighbours.values() for n in neighbours)
+        )
+        student_count = len(student_skills)
+
+        bounds = {}
+        for key in exact_counts.keys() | fuzzy_counts.keys():
+            total = self.skill_counts[key]
+            fuzzy_count = min(fuzzy_counts.get(key, 0), student_count, self.distinct_counts[key])
+            bounds[key] = min(
+                OVERLAP_WEIGHT * exact_counts.get(key, 0) / total +
+                FUZZY_WEIGHT * fuzzy_count / total +
+                CERT_WEIGHT,
+                1.0
+            )
+        return bounds
+
+    def candidates(self, student_skills: List[str], fuzzy_neighbours: Dict[str, List[str]],
+                   threshold: float) -> List[str]:
+        if threshold <= CERT_WEIGHT + ROUNDING_SLACK:
+            return self.keys()
+        bounds = self.upper_bounds(student_skills, fuzzy_neighbours)
+        return sorted(key for key, bound in bounds.items() if bound + ROUNDING_SLACK >= threshold)
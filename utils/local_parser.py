@@ -0,0 +1,133 @@
+import re
+from typing import Dict, List, Tuple
+
+try:
+    import pymupdf
+except ImportError:
+    import fitz as pymupdf
+
+SECTION_HEADINGS = {
+    "objective": {"objective", "career objective", "summary", "professional summary", "profile", "about me"},
+    "education": {"education", "academic background", "academics", "education & qualifications"},
+    "skills": {"skills", "technical skills", "key skills", "core competencies", "skills & tools"},
+    "experience": {"experience", "work experience", "professional experience", "internships",
+                   "internship experience", "employment history"},
+    "projects": {"projects", "academic projects", "personal projects", "key projects"},
+    "certifications": {"certifications", "certificates", "courses", "courses & certifications",
+                       "certifications & courses", "licenses & certifications"},
+}
+HEADING_LOOKUP = {heading: field for field, headings in SECTION_HEADINGS.items() for heading in headings}
+LOCAL_PARSER_VERSION = "2"
+REQUIRED_SIGNALS = ("name", "email", "skills", "education", "experience_or_projects")
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"\+?\(?\d[\d\s().-]{7,}\d")
+LINK_RE = re.compile(r"(?:https?://|www\.)\S+|(?:linkedin|github)\.com/\S+", re.IGNORECASE)
+BULLET_CHARS = "•·●▪-– "
+DATE_LINE_RE = re.compile(
+    r"^(?:expected\s+graduation|graduat|present\b|(?:19|20)\d{2}\b|"
+    r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(?:19|20)\d{2}\b)",
+    re.IGNORECASE
+)
+
+
+def _heading_field(line: str):
+    key = re.sub(r"\s+", " ", line.strip().rstrip(":")).lower()
+    if len(key.split()) > 4:
+        return None
+    return HEADING_LOOKUP.get(key)
+
+
+def _is_multi_column(page) -> bool:
+    width = page.rect.width
+    blocks = [b for b in page.get_text("blocks") if b[6] == 0 and b[4].strip()]
+    if len(blocks) < 4:
+        return False
+    right_side = [b for b in blocks if b[0] > width * 0.45]
+    return len(right_side) / len(blocks) > 0.2
+
+
+def _is_continuation(line: str) -> bool:
+    text = line.strip()
+    if text[0] in BULLET_CHARS or _heading_field(text):
+        return False
+    return line[0].isspace() or text[0].islower() or bool(DATE_LINE_RE.match(text))
+
+
+def _clean_items(lines: List[str]) -> List[str]:
+    items = []
+    joinable = hyphenated = False
+    for line in lines:
+        text = re.sub(r"\s+", " ", line.strip().strip(BULLET_CHARS).strip())
+        if not text:
+            joinable = False
+            continue
+        if joinable and _is_continuation(line):
+            items[-1] += ("-" if hyphenated and text[0].islower() else " ") + text
+        else:
+            items.append(text)
+        joinable = True
+        hyphenated = line.rstrip().endswith("-")
+    return items
+
+
+def extract_pdf_lines(document_data: bytes) -> Tuple[List[str], bool]:
+    lines = []
+    multi_column = False
+    with pymupdf.open(stream=document_data, filetype="pdf") as doc:
+        for page in doc:
+            multi_column = multi_column or _is_multi_column(page)
+            lines.extend(page.get_text("text", sort=True).splitlines())
+    return lines, multi_column
+
+
+def segment_resume_lines(lines: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+    header = []
+    sections: Dict[str, List[str]] = {}
+    current = None
+    for line in lines:
+        field = _heading_field(line)
+        if field:
+            current = field
+            sections.setdefault(field, [])
+        elif current is None:
+            if line.strip():
+                header.append(line.strip())
+        else:
+            sections[current].append(line)
+    return header, sections
+
+
+def parse_resume_locally(document_data: bytes) -> Tuple[dict, float]:
+    lines, multi_column = extract_pdf_lines(document_data)
+    header, sections = segment_resume_lines(lines)
+    header_text = " | ".join(header)
+
+    email = EMAIL_RE.search(header_text)
+    phone = PHONE_RE.search(header_text)
+    education = _clean_items(sections.get("education", []))
+    profile = {
+        "name": header[0] if header and not EMAIL_RE.search(header[0]) else "",
+        "email": email.group(0) if email else "",
+        "phone": phone.group(0).strip() if phone else "",
+        "social_links": LINK_RE.findall(header_text),
+        "objective": " ".join(_clean_items(sections.get("objective", []))),
+        "certifications": _clean_items(sections.get("certifications", [])),
+        "skills": _clean_items(sections.get("skills", [])),
+        "experience": _clean_items(sections.get("experience", [])),
+        "projects": _clean_items(sections.get("projects", [])),
+        "education_raw": "\n".join(education),
+        "education": education,
+    }
+
+    signals = {
+        "name": bool(profile["name"]),
+        "email": bool(profile["email"]),
+        "skills": bool(profile["skills"]),
+        "education": bool(profile["education"]),
+        "experience_or_projects": bool(profile["experience"] or profile["projects"]),
+    }
+    confidence = sum(signals[s] for s in REQUIRED_SIGNALS) / len(REQUIRED_SIGNALS)
+    if multi_column:
+        confidence *= 0.5
+    return profile, round(confidence, 3)
@@ -0,0 +1,201 @@
+import json
+import time
+import sqlite3
+import hashlib
+from typing import Dict, List, Optional
+
+from utils import tracing
+from utils.store import SkillStore
+from utils.skill_index import opportunity_content_hash
+from utils.fuzzy_index import FuzzySkillIndex
+from utils.smart_matcher import (
+    catalog_indexes,
+    certification_scores,
+    candidate_certification_scores,
+    skill_scores,
+    combine_scores,
+    rank_matches
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS match_results (
+    profile_key TEXT NOT NULL,
+    opportunity_key TEXT NOT NULL,
+    opportunity_hash TEXT NOT NULL,
+    skills_fingerprint TEXT NOT NULL,
+    certs_fingerprint TEXT NOT NULL,
+    overlap_score REAL NOT NULL,
+    fuzzy_score REAL NOT NULL,
+    cert_score REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (profile_key, opportunity_key)
+);
+CREATE INDEX IF NOT EXISTS idx_match_results_opportunity ON match_results(opportunity_key);
+"""
+
+
+def _fingerprint(values: List[str]) -> str:
+    payload = json.dumps(sorted(values), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def skills_fingerprint(profile: dict) -> str:
+    return _fingerprint(profile.get("extracted_skills", []))
+
+
+def certs_fingerprint(profile: dict) -> str:
+    return _fingerprint(profile.get("certifications", []))
+
+
+def opportunity_hash(opp: dict) -> str:
+    return opp.get("skills_hash") or opportunity_content_hash(opp)
+
+
+class MatchStore:
+    def __init__(self, store: SkillStore):
+        self.store = store
+        with store.connection() as conn:
+            conn.executescript(SCHEMA)
+        store.opportunities.on_delete(self.remove_opportunity)
+        store.profiles.on_delete(self.remove_profile)
+
+    def _rows(self, profile_key: str) -> Dict[str, dict]:
+        rows = self.store.connection().execute(
+            "SELECT opportunity_key, opportunity_hash, skills_fingerprint, certs_fingerprint, "
+            "overlap_score, fuzzy_score, cert_score FROM match_results WHERE profile_key = ?",
+            (profile_key,)
+        )
+        return self._components(rows)
+
+    @staticmethod
+    def _components(rows) -> Dict[str, dict]:
+        return {
+            row[0]: {
+                "opportunity_hash": row[1], "skills_fingerprint": row[2], "certs_fingerprint": row[3],
+                "overlap_score": row[4], "fuzzy_score": row[5], "cert_score": row[6],
+            }
+            for row in rows
+        }
+
+    def _upsert(self, rows: List[tuple]):
+        if not rows:
+            return
+        with self.store.connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO match_results (profile_key, opportunity_key, opportunity_hash, "
+                "skills_fingerprint, certs_fingerprint, overlap_score, fuzzy_score, cert_score, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def _candidate_rows(self, profile_key: str, keys: List[str]) -> Dict[str, dict]:
+        stored = {}
+        conn = self.store.connection()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            stored.update(self._components(conn.execute(
+                "SELECT opportunity_key, opportunity_hash, skills_fingerprint, certs_fingerprint, "
+                "overlap_score, fuzzy_score, cert_score FROM match_results "
+                f"WHERE profile_key = ? AND opportunity_key IN ({', '.join('?' * len(chunk))})",
+                (profile_key, *chunk)
+            )))
+        return stored
+
+    def score_profile(self, profile_key: str, student_json: dict, opportunities: Dict[str, dict],
+                      threshold: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        skills_fp = skills_fingerprint(student_json)
+        certs_fp = certs_fingerprint(student_json)
+        inverted_index, fuzzy_index, skill_matrix = catalog_indexes(opportunities)
+        stu_skills = student_json.get("extracted_skills", [])
+        fuzzy_neighbours = fuzzy_index.resolve(stu_skills)
+        if threshold is None:
+            keys = inverted_index.keys()
+            stored = self._rows(profile_key)
+        else:
+            keys = inverted_index.candidates(stu_skills, fuzzy_neighbours, threshold)
+            stored = self._candidate_rows(profile_key, keys)
+        hashes = {key: opportunity_hash(opportunities[key]) for key in keys}
+
+        def stale(key: str, field: str, fingerprint: str) -> bool:
+            row = stored.get(key)
+            return row is None or row["opportunity_hash"] != hashes[key] or row[field] != fingerprint
+
+        skill_keys = [key for key in keys if stale(key, "skills_fingerprint", skills_fp)]
+        cert_keys = [key for key in keys if stale(key, "certs_fingerprint", certs_fp)]
+
+        with tracing.span("matching.incremental", opportunities=len(opportunities), candidates=len(keys),
+                          skills_rescored=len(skill_keys), certs_rescored=len(cert_keys)):
+            components = {key: dict(stored[key]) for key in keys if key in stored}
+            if skill_keys:
+                overlaps = skill_matrix.overlap_by_key(stu_skills, skill_keys)
+                for key in skill_keys:
+                    overlap, fuzzy = skill_scores(student_json, opportunities[key], fuzzy_neighbours, overlaps[key])
+                    components.setdefault(key, {}).update(overlap_score=overlap, fuzzy_score=fuzzy)
+            if cert_keys:
+                cert_scores = certification_scores(
+                    student_json.get("certifications", []), {key: opportunities[key] for key in cert_keys}
+                )
+                for key in cert_keys:
+                    components[key]["cert_score"] = cert_scores[key]
+
+            now = time.time()
+            self._upsert([
+                (profile_key, key, hashes[key], skills_fp, certs_fp,
+                 components[key]["overlap_score"], components[key]["fuzzy_score"], components[key]["cert_score"], now)
+                for key in dict.fromkeys(skill_keys + cert_keys)
+            ])
+            if threshold is None:
+                self._remove_missing(profile_key, stored, opportunities)
+
+        return {
+            key: combine_scores(c["overlap_score"], c["fuzzy_score"], c["cert_score"])
+            for key, c in components.items()
+        }
+
+    def score_opportunity(self, opportunity_key: str, opp_json: dict,
+                          profiles: Dict[str, dict]) -> Dict[str, Dict[str, float]]:
+        opp_hash = opportunity_hash(opp_json)
+        with tracing.span("matching.incremental_opportunity", profiles=len(profiles)):
+            cert_scores = candidate_certification_scores(opp_json, profiles)
+            fuzzy_neighbours = FuzzySkillIndex(opp_json.get("extracted_skills", [])).resolve(
+                skill for profile in profiles.values() for skill in profile.get("extracted_skills", [])
+            )
+            now = time.time()
+            rows, results = [], {}
+            for key, profile in profiles.items():
+                overlap, fuzzy = skill_scores(profile, opp_json, fuzzy_neighbours)
+                rows.append((key, opportunity_key, opp_hash, skills_fingerprint(profile), certs_fingerprint(profile),
+                             overlap, fuzzy, cert_scores[key], now))
+                results[key] = combine_scores(overlap, fuzzy, cert_scores[key])
+            self._upsert(rows)
+        return results
+
+    def _remove_missing(self, profile_key: str, stored: Dict[str, dict], opportunities: Dict[str, dict]):
+        removed = [key for key in stored if key not in opportunities]
+        if removed:
+            with self.store.connection() as conn:
+                conn.executemany(
+                    "DELETE FROM match_results WHERE profile_key = ? AND opportunity_key = ?",
+                    [(profile_key, key) for key in removed]
+                )
+
+    @staticmethod
+    def remove_opportunity(conn: sqlite3.Connection, opportunity_key: str):
+        conn.execute("DELETE FROM match_results WHERE opportunity_key = ?", (opportunity_key,))
+
+    @staticmethod
+    def remove_profile(conn: sqlite3.Connection, profile_key: str):
+        conn.execute("DELETE FROM match_results WHERE profile_key = ?", (profile_key,))
+
+    def results(self, profile_key: str, opportunities: Optional[Dict[str, dict]] = None) -> Dict[str, Dict[str, float]]:
+        results = {}
+        for key, row in self._rows(profile_key).items():
+            if opportunities is not None and (key not in opportunities or
+                                              row["opportunity_hash"] != opportunity_hash(opportunities[key])):
+                continue
+            results[key] = combine_scores(row["overlap_score"], row["fuzzy_score"], row["cert_score"])
+        return results
+
+    def matches(self, profile_key: str, threshold: float = 0.60,
+                opportunities: Optional[Dict[str, dict]] = None) -> List[Dict[str, any]]:
+        return rank_matches(self.results(profile_key, opportunities), threshold)
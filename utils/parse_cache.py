@@ -0,0 +1,74 @@
+import os
+import json
+import hashlib
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", "data/json/resume_cache")
+PARSE_CACHE_MAX_BYTES = int(os.getenv("PARSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+def parse_cache_key(document_data: bytes, parser: str, version: str) -> str:
+    digest = hashlib.sha256(document_data)
+    digest.update(b"\0" + (parser or "").encode("utf-8") + b"\0" + (version or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ParseCache:
+    def __init__(self, cache_dir: str = PARSE_CACHE_DIR, max_bytes: int = PARSE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                profile = json.load(f)
+            os.utime(path)
+            return profile
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Discarding unreadable parse cache entry %s: %s", key, e)
+            self.discard(key)
+            return None
+
+    def put(self, key: str, profile: dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(profile, f, indent=2)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def discard(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(".json"):
+                path = os.path.join(self.cache_dir, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
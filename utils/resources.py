@@ -0,0 +1,78 @@
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+_loaders: Dict[str, Callable[[], Any]] = {}
+_instances: Dict[str, Any] = {}
+_load_times: Dict[str, float] = {}
+_locks: Dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def register(name: str, loader: Callable[[], Any]):
+    with _registry_lock:
+        _loaders[name] = loader
+        _locks.setdefault(name, threading.Lock())
+
+
+def get(name: str) -> Any:
+    if name in _instances:
+        return _instances[name]
+    if name not in _loaders:
+        raise KeyError(f"No resource registered under '{name}'.")
+    with _locks[name]:
+        if name not in _instances:
+            start = time.perf_counter()
+            _instances[name] = _loaders[name]()
+            _load_times[name] = time.perf_counter() - start
+            logger.info("Loaded resource %s in %.3fs", name, _load_times[name])
+    return _instances[name]
+
+
+def override(name: str, instance: Any):
+    with _registry_lock:
+        lock = _locks.setdefault(name, threading.Lock())
+    with lock:
+        _instances[name] = instance
+        _load_times.pop(name, None)
+
+
+def reset(name: str):
+    with _registry_lock:
+        lock = _locks.setdefault(name, threading.Lock())
+    with lock:
+        _instances.pop(name, None)
+        _load_times.pop(name, None)
+
+
+def is_loaded(name: str) -> bool:
+    return name in _instances
+
+
+def registered() -> List[str]:
+    return sorted(_loaders)
+
+
+def load_times() -> Dict[str, float]:
+    return dict(_load_times)
+
+
+def warmup(names: List[str] = None, background: bool = True):
+    names = list(names) if names is not None else registered()
+
+    def load_all():
+        for name in names:
+            try:
+                get(name)
+            except Exception as e:
+                logger.warning("Warmup of resource %s failed: %s", name, e)
+
+    if not background:
+        load_all()
+        return None
+    thread = threading.Thread(target=load_all, name="resource-warmup", daemon=True)
+    thread.start()
+    return thread
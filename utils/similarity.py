@@ -0,0 +1,52 @@
+import numpy as np
+from typing import List, Dict, Tuple
+
+
+def normalize_rows(vectors) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def similarity_matrix(left, right, normalized: bool = False) -> np.ndarray:
+    if not normalized:
+        left, right = normalize_rows(left), normalize_rows(right)
+    return left @ right.T
+
+
+def max_similarity(left, right, normalized: bool = False) -> float:
+    if len(left) == 0 or len(right) == 0:
+        return 0.0
+    return float(similarity_matrix(left, right, normalized).max())
+
+
+def top_k_similarity(left, right, k: int = 1, normalized: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    sims = similarity_matrix(left, right, normalized)
+    k = min(k, sims.shape[1])
+    top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+    top_sims = np.take_along_axis(sims, top, axis=1)
+    order = np.argsort(-top_sims, axis=1, kind="stable")
+    return np.take_along_axis(top_sims, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+
+class StackedEmbeddings:
+    def __init__(self, groups: Dict[str, List[np.ndarray]]):
+        self.keys = [key for key, vectors in groups.items() if len(vectors)]
+        self.offsets = np.zeros(len(self.keys), dtype=np.int64)
+        blocks = []
+        row = 0
+        for i, key in enumerate(self.keys):
+            self.offsets[i] = row
+            blocks.append(normalize_rows(groups[key]))
+            row += len(groups[key])
+        self.matrix = np.vstack(blocks) if blocks else np.zeros((0, 0), dtype=np.float32)
+
+    def max_similarity(self, query) -> Dict[str, float]:
+        if not self.keys or len(query) == 0:
+            return {}
+        column_max = similarity_matrix(normalize_rows(query), self.matrix, normalized=True).max(axis=0)
+        group_max = np.maximum.reduceat(column_max, self.offsets)
+        return dict(zip(self.keys, map(float, group_max)))
@@ -0,0 +1,117 @@
+import os
+import json
+import hashlib
+from typing import List, Dict
+
+from utils.entity_extractor import (
+    extractor_fingerprint,
+    normalize_keywords,
+    extract_skills_from_opportunity,
+    extract_skills_from_resume
+)
+
+OPPORTUNITY_SKILL_FIELDS = ("required_skills", "description", "role", "mandatory_certifications")
+RESUME_SKILL_FIELDS = ("skills", "projects", "experience", "certifications")
+OPPORTUNITY_LIST_FIELDS = ("required_skills", "mandatory_certifications", "extracted_skills")
+
+
+def _content_hash(doc: dict, fields: tuple) -> str:
+    content = {field: doc.get(field) for field in fields}
+    content["extractor"] = extractor_fingerprint()
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def opportunity_content_hash(opp: dict) -> str:
+    return _content_hash(opp, OPPORTUNITY_SKILL_FIELDS)
+
+
+def resume_content_hash(profile: dict) -> str:
+    return _content_hash(profile, RESUME_SKILL_FIELDS)
+
+
+def validate_opportunity(opp: dict) -> dict:
+    if not isinstance(opp, dict):
+        raise ValueError("Opportunity must be a JSON object.")
+    for field in OPPORTUNITY_LIST_FIELDS:
+        value = opp.get(field, [])
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            raise ValueError(f"Opportunity field '{field}' must be a list of strings.")
+    return opp
+
+
+def is_opportunity_indexed(opp: dict) -> bool:
+    return "extracted_skills" in opp and opp.get("skills_hash") == opportunity_content_hash(opp)
+
+
+def index_opportunity(opp: dict) -> dict:
+    opp["extracted_skills"] = normalize_keywords(extract_skills_from_opportunity(opp))
+    opp["skills_hash"] = opportunity_content_hash(opp)
+    return opp
+
+
+def save_opportunity(opp: dict, path: str) -> dict:
+    if not is_opportunity_indexed(opp):
+        index_opportunity(opp)
+    with open(path, "w") as f:
+        json.dump(opp, f, indent=2)
+    return opp
+
+
+def load_indexed_opportunity(path: str) -> dict:
+    with open(path, "r") as f:
+        opp = validate_opportunity(json.load(f))
+    if not is_opportunity_indexed(opp):
+        save_opportunity(opp, path)
+    return opp
+
+
+def get_opportunity_skills(opp: dict) -> List[str]:
+    if not is_opportunity_indexed(opp):
+        index_opportunity(opp)
+    return opp["extracted_skills"]
+
+
+def is_resume_indexed(profile: dict) -> bool:
+    return "extracted_skills" in profile and profile.get("skills_hash") == resume_content_hash(profile)
+
+
+def index_resume(profile: dict, extracted_skills: List[str] = None) -> dict:
+    if extracted_skills is None:
+        extracted_skills = extract_skills_from_resume(profile)
+    profile["extracted_skills"] = normalize_keywords(extracted_skills)
+    profile["skills_hash"] = resume_content_hash(profile)
+    return profile
+
+
+def save_resume(profile: dict, path: str, extracted_skills: List[str] = None) -> dict:
+    if extracted_skills is not None or not is_resume_indexed(profile):
+        index_resume(profile, extracted_skills)
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=2)
+    return profile
+
+
+def load_indexed_resume(path: str) -> dict:
+    with open(path, "r") as f:
+        profile = json.load(f)
+    if not is_resume_indexed(profile):
+        save_resume(profile, path)
+    return profile
+
+
+def build_opportunity_index(opportunity_dir: str) -> Dict[str, List[str]]:
+    index = {}
+    for filename in sorted(os.listdir(opportunity_dir)):
+        if filename.endswith(".json"):
+            opp = load_indexed_opportunity(os.path.join(opportunity_dir, filename))
+            index[filename] = opp["extracted_skills"]
+    return index
+
+
+if __name__ == "__main__":
+    import sys
+
+    target_dir = sys.argv[1] if len(sys.argv) > 1 else "data/json/opportunities"
+    for name, skills in build_opportunity_index(target_dir).items():
+        print(f"{name}: {len(skills)} skills")
@@ -0,0 +1,108 @@
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+
+class SkillVocabulary:
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._skills: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def intern(self, skill: str) -> int:
+        skill = skill.lower()
+        skill_id = self._ids.get(skill)
+        if skill_id is None:
+            skill_id = len(self._skills)
+            self._skills.append(skill)
+            self._ids[skill] = skill_id
+        return skill_id
+
+    def lookup(self, skills: Iterable[str]) -> np.ndarray:
+        ids = {self._ids.get(skill.lower()) for skill in skills}
+        ids.discard(None)
+        return np.fromiter(ids, dtype=np.int32, count=len(ids))
+
+    def skill(self, skill_id: int) -> str:
+        return self._skills[skill_id]
+
+
+class SkillMatrix:
+    def __init__(self, opportunities: Dict[str, dict], vocabulary: SkillVocabulary = None):
+        self.vocabulary = vocabulary if vocabulary is not None else SkillVocabulary()
+        self.keys = list(opportunities)
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+
+        indptr = np.zeros(len(self.keys) + 1, dtype=np.int64)
+        indices = []
+        totals = np.ones(len(self.keys), dtype=np.float64)
+        for row, key in enumerate(self.keys):
+            skills = opportunities[key].get("extracted_skills", [])
+            ids = sorted({self.vocabulary.intern(skill) for skill in skills})
+            indices.extend(ids)
+            indptr[row + 1] = indptr[row] + len(ids)
+            totals[row] = max(len(skills), 1)
+
+        self.indptr = indptr
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.row_totals = totals
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.indices.nbytes + self.row_totals.nbytes
+
+    def updated(self, added: Dict[str, dict], removed: Iterable[str]) -> "SkillMatrix":
+        keep = np.ones(len(self.keys), dtype=bool)
+        keep[self.rows_for(removed)] = False
+        lengths = np.diff(self.indptr)
+        appended = SkillMatrix(added, self.vocabulary)
+
+        matrix = SkillMatrix({}, self.vocabulary)
+        matrix.keys = [key for key, kept in zip(self.keys, keep) if kept] + appended.keys
+        matrix.rows = {key: row for row, key in enumerate(matrix.keys)}
+        matrix.indptr = np.concatenate(([0], np.cumsum(np.concatenate((lengths[keep], np.diff(appended.indptr))))))
+        matrix.indices = np.concatenate((self.indices[np.repeat(keep, lengths)], appended.indices))
+        matrix.row_totals = np.concatenate((self.row_totals[keep], appended.row_totals))
+        return matrix
+
+    def rows_for(self, keys: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self.rows[key] for key in keys), dtype=np.int64)
+
+    def overlap_counts(self, skills: Iterable[str], rows: np.ndarray = None) -> np.ndarray:
+        # Look ids up before sizing the query: matrices derived through updated()
+        # share this vocabulary and may intern new skills concurrently.
+        ids = self.vocabulary.lookup(skills)
+        query = np.zeros(len(self.vocabulary), dtype=bool)
+        query[ids] = True
+        if rows is None:
+            indptr, indices = self.indptr, self.indices
+        else:
+            starts = self.indptr[rows]
+            lengths = self.indptr[rows + 1] - starts
+            indptr = np.concatenate(([0], np.cumsum(lengths)))
+            positions = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+            indices = self.indices[positions]
+        hits = np.concatenate(([0], np.cumsum(query[indices], dtype=np.int32)))
+        return hits[indptr[1:]] - hits[indptr[:-1]]
+
+    def overlap_scores(self, skills: Iterable[str], rows: np.ndarray = None) -> np.ndarray:
+        totals = self.row_totals if rows is None else self.row_totals[rows]
+        return self.overlap_counts(skills, rows) / totals
+
+    def overlap_by_key(self, skills: Iterable[str], keys: List[str]) -> Dict[str, float]:
+        return dict(zip(keys, self.overlap_scores(skills, self.rows_for(keys)).tolist()))
+
+    def top_k(self, skills: Iterable[str], k: int = 10) -> List[tuple]:
+        scores = self.overlap_scores(skills)
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        cutoff = np.partition(scores, len(scores) - k)[len(scores) - k]
+        tied = np.flatnonzero(scores >= cutoff).tolist()
+        ranked = sorted(tied, key=lambda row: (-scores[row], self.keys[row]))[:k]
+        return [(self.keys[row], float(scores[row])) for row in ranked]
@@ -1,20 +1,58 @@
 import os
 import json
+import heapq
+import logging
 import numpy as np
-from typing import List, Dict
-from sentence_transformers import SentenceTransformer
+import threading
+from typing import List, Dict, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import difflib
 
 from utils.entity_extractor import (
     normalize_keywords,
-    extract_skills_from_resume,
-    extract_skills_from_opportunity
+    extract_skills_from_resume
 )
+from utils.skill_index import load_indexed_opportunity, get_opportunity_skills, validate_opportunity
+from utils.embedding_cache import EmbeddingCache, to_cache_precision
+from utils.similarity import max_similarity, StackedEmbeddings
+from utils.fuzzy_index import FuzzySkillIndex
+from utils.inverted_index import SkillInvertedIndex
+from utils.skill_matrix import SkillMatrix
+from utils import resources, tracing
 
-model = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
+logger = logging.getLogger(__name__)
+
+EXECUTION_MODES = ("serial", "thread", "process")
+DEFAULT_MAX_WORKERS = 4
+CATALOG_REBUILD_FRACTION = float(os.getenv("CATALOG_REBUILD_FRACTION", "0.25"))
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+def _load_sentence_transformer():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(MODEL_NAME, device="cpu")
+
+resources.register("sentence_transformer", _load_sentence_transformer)
+embedding_cache = EmbeddingCache(MODEL_NAME)
+
+_catalog_indexes = None
+_catalog_indexes_lock = threading.Lock()
 
 def embed_list(items: List[str]) -> List[np.ndarray]:
-    return [model.encode([item], convert_to_numpy=True)[0] for item in items]
+    if not items:
+        return []
+    keys = [embedding_cache.key(item) for item in items]
+    vectors = embedding_cache.get_many(keys)
+    missing = {key: item for key, item in zip(keys, items) if key not in vectors}
+    tracing.increment("cache_lookups", len(keys) - len(missing), cache="embedding", result="hit")
+    tracing.increment("cache_lookups", len(missing), cache="embedding", result="miss")
+    if missing:
+        with tracing.span("embedding.encode", items=len(missing)):
+            encoded = resources.get("sentence_transformer").encode(list(missing.values()), convert_to_numpy=True)
+        fresh = {key: to_cache_precision(vector) for key, vector in zip(missing.keys(), encoded)}
+        embedding_cache.put_many(fresh)
+        vectors.update(fresh)
+    return [vectors[key] for key in keys]
 
 def cosine_similarity(vec1, vec2) -> float:
     return float(np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2)))
@@ -22,13 +60,17 @@ def cosine_similarity(vec1, vec2) -> float:
 def aggregate_similarity(list1: List[np.ndarray], list2: List[np.ndarray]) -> float:
     if not list1 or not list2:
         return 0.0
-    sims = [cosine_similarity(a, b) for a in list1 for b in list2]
-    return max(sims) if sims else 0.0
+    return max_similarity(list1, list2)
 
-def fuzzy_match_skills(stu_skills: List[str], opp_skills: List[str], threshold: float = 0.8) -> List[str]:
+def fuzzy_match_skills(stu_skills: List[str], opp_skills: List[str], threshold: float = 0.8,
+                       neighbours: Dict[str, List[str]] = None) -> List[str]:
+    opp_lookup = set(opp_skills)
     matches = []
     for skill in stu_skills:
-        match = difflib.get_close_matches(skill, opp_skills, n=1, cutoff=threshold)
+        if neighbours is not None and skill in neighbours:
+            match = [n for n in neighbours[skill] if n in opp_lookup][:1]
+        else:
+            match = difflib.get_close_matches(skill, opp_skills, n=1, cutoff=threshold)
         if match:
             matches.append(match[0])
     return matches
@@ -37,25 +79,42 @@ def certification_similarity(student_certs: List[str], opp_certs: List[str], opp
     if not opp_certs:
         matched = [c for c in student_certs if any(k.lower() in c.lower() for k in opp_skills)]
         return 1.0 if matched else 0.5
-    return aggregate_similarity(embed_list(student_certs), embed_list(opp_certs))
+    vectors = embed_list(student_certs + opp_certs)
+    return aggregate_similarity(vectors[:len(student_certs)], vectors[len(student_certs):])
 
-def compute_match_score(student_json: dict, opp_json: dict) -> Dict[str, float]:
-    stu_skills = student_json.get("extracted_skills", [])
-    opp_skills = opp_json.get("extracted_skills", [])
+def certification_scores(student_certs: List[str], opportunities: Dict[str, dict]) -> Dict[str, float]:
+    scores = {
+        key: certification_similarity(student_certs, [], opp_json.get("extracted_skills", []))
+        for key, opp_json in opportunities.items()
+        if not opp_json.get("mandatory_certifications")
+    }
+    with_certs = {key: opp_json["mandatory_certifications"] for key, opp_json in opportunities.items() if key not in scores}
+    if not with_certs:
+        return scores
 
-    stu_set = set(map(str.lower, stu_skills))
-    opp_set = set(map(str.lower, opp_skills))
+    all_certs = [cert for certs in with_certs.values() for cert in certs]
+    vectors = embed_list(student_certs + all_certs)
+    student_vectors = vectors[:len(student_certs)]
+    opp_vectors = iter(vectors[len(student_certs):])
+    stacked = StackedEmbeddings({key: [next(opp_vectors) for _ in certs] for key, certs in with_certs.items()})
+    sims = stacked.max_similarity(student_vectors)
+    for key in with_certs:
+        scores[key] = sims.get(key, 0.0)
+    return scores
 
-    exact_matches = stu_set & opp_set
-    fuzzy_matches = set(fuzzy_match_skills(stu_skills, opp_skills))
+def skill_scores(student_json: dict, opp_json: dict, fuzzy_neighbours: Dict[str, List[str]] = None,
+                 overlap_score: float = None) -> Tuple[float, float]:
+    stu_skills = student_json.get("extracted_skills", [])
+    opp_skills = opp_json.get("extracted_skills", [])
 
-    overlap_score = len(exact_matches) / max(len(opp_skills), 1)
+    if overlap_score is None:
+        exact_matches = set(map(str.lower, stu_skills)) & set(map(str.lower, opp_skills))
+        overlap_score = len(exact_matches) / max(len(opp_skills), 1)
+    fuzzy_matches = set(fuzzy_match_skills(stu_skills, opp_skills, neighbours=fuzzy_neighbours))
     fuzzy_score = len(fuzzy_matches) / max(len(opp_skills), 1)
+    return overlap_score, fuzzy_score
 
-    stu_certs = student_json.get("certifications", [])
-    opp_certs = opp_json.get("mandatory_certifications", [])
-    cert_score = certification_similarity(stu_certs, opp_certs, opp_skills)
-
+def combine_scores(overlap_score: float, fuzzy_score: float, cert_score: float) -> Dict[str, float]:
     final_score = (
         0.6 * overlap_score +
         0.3 * fuzzy_score +
@@ -69,31 +128,195 @@ def compute_match_score(student_json: dict, opp_json: dict) -> Dict[str, float]:
         "final_score": round(min(final_score, 1.0), 3)
     }
 
-def find_best_matches(student_json_path: str, opportunity_dir: str, threshold: float = 0.60) -> List[Dict[str, any]]:
+def compute_match_score(student_json: dict, opp_json: dict, cert_score: float = None,
+                        fuzzy_neighbours: Dict[str, List[str]] = None, overlap_score: float = None) -> Dict[str, float]:
+    overlap_score, fuzzy_score = skill_scores(student_json, opp_json, fuzzy_neighbours, overlap_score)
+    if cert_score is None:
+        cert_score = certification_similarity(
+            student_json.get("certifications", []),
+            opp_json.get("mandatory_certifications", []),
+            opp_json.get("extracted_skills", [])
+        )
+    return combine_scores(overlap_score, fuzzy_score, cert_score)
+
+def _run_isolated(fn: Callable, jobs: Dict[str, tuple], executor=None) -> Dict[str, any]:
+    results = {}
+    if executor is None:
+        for key, args in jobs.items():
+            try:
+                results[key] = fn(*args)
+            except Exception as e:
+                logger.warning("Skipping opportunity %s: %s", key, e)
+        return results
+
+    futures = {key: executor.submit(fn, *args) for key, args in jobs.items()}
+    for key, future in futures.items():
+        try:
+            results[key] = future.result()
+        except Exception as e:
+            logger.warning("Skipping opportunity %s: %s", key, e)
+    return results
+
+def load_opportunities(opportunity_dir: str, mode: str = "serial", max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, dict]:
+    jobs = {
+        filename: (os.path.join(opportunity_dir, filename),)
+        for filename in sorted(os.listdir(opportunity_dir))
+        if filename.endswith(".json")
+    }
+    if mode == "serial":
+        return _run_isolated(load_indexed_opportunity, jobs)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return _run_isolated(load_indexed_opportunity, jobs, executor)
+
+def usable_opportunities(opportunities: Dict[str, dict]) -> Dict[str, dict]:
+    usable = {}
+    for key, opp_json in opportunities.items():
+        try:
+            usable[key] = validate_opportunity(opp_json)
+        except ValueError as e:
+            logger.warning("Skipping opportunity %s: %s", key, e)
+    return usable
+
+def _build_catalog_indexes(opportunities: Dict[str, dict]) -> tuple:
+    usable = usable_opportunities(opportunities)
+    fuzzy_index = FuzzySkillIndex(
+        skill for opp_json in usable.values() for skill in opp_json.get("extracted_skills", [])
+    )
+    return opportunities, usable, SkillInvertedIndex(usable), fuzzy_index, SkillMatrix(usable)
+
+def _update_catalog_indexes(previous: tuple, opportunities: Dict[str, dict]) -> tuple:
+    previous_opportunities, indexed, inverted_index, fuzzy_index, skill_matrix = previous
+    changed = {key: opp_json for key, opp_json in opportunities.items() if previous_opportunities.get(key) is not opp_json}
+    removed = {key: opp_json for key, opp_json in indexed.items() if opportunities.get(key) is not opp_json}
+    if len(changed) + len(removed) > CATALOG_REBUILD_FRACTION * len(indexed):
+        return _build_catalog_indexes(opportunities)
+    added = usable_opportunities(changed)
+
+    usable = {key: opp_json for key, opp_json in indexed.items() if key not in removed}
+    usable.update(added)
+    fuzzy_index = fuzzy_index.updated(
+        (skill for opp_json in added.values() for skill in opp_json.get("extracted_skills", [])),
+        (skill for opp_json in removed.values() for skill in opp_json.get("extracted_skills", []))
+    )
+    return (opportunities, usable, inverted_index.updated(added, removed), fuzzy_index,
+            skill_matrix.updated(added, removed))
+
+def catalog_indexes(opportunities: Dict[str, dict]) -> Tuple[SkillInvertedIndex, FuzzySkillIndex, SkillMatrix]:
+    global _catalog_indexes
+    with _catalog_indexes_lock:
+        if _catalog_indexes is None:
+            _catalog_indexes = _build_catalog_indexes(opportunities)
+        elif _catalog_indexes[0] is not opportunities:
+            _catalog_indexes = _update_catalog_indexes(_catalog_indexes, opportunities)
+        return _catalog_indexes[2:]
+
+def score_opportunities(student_json: dict, opportunities: Dict[str, dict], mode: str = "serial",
+                        max_workers: int = DEFAULT_MAX_WORKERS, threshold: float = None) -> Dict[str, Dict[str, float]]:
+    with tracing.span("matching.score", opportunities=len(opportunities), mode=mode):
+        inverted_index, fuzzy_index, skill_matrix = catalog_indexes(opportunities)
+        stu_skills = student_json.get("extracted_skills", [])
+        with tracing.span("matching.fuzzy_resolve", skills=len(stu_skills)):
+            fuzzy_neighbours = fuzzy_index.resolve(stu_skills)
+        if threshold is not None:
+            candidates = inverted_index.candidates(stu_skills, fuzzy_neighbours, threshold)
+        else:
+            candidates = inverted_index.keys()
+        opportunities = {key: opportunities[key] for key in candidates}
+        tracing.annotate(candidates=len(opportunities))
+        overlaps = skill_matrix.overlap_by_key(stu_skills, list(opportunities))
+
+        with tracing.span("matching.certifications"):
+            cert_scores = certification_scores(student_json.get("certifications", []), opportunities)
+        jobs = {
+            filename: (student_json, opp_json, cert_scores.get(filename), fuzzy_neighbours, overlaps[filename])
+            for filename, opp_json in opportunities.items()
+        }
+        if mode == "serial":
+            return _run_isolated(compute_match_score, jobs)
+        pool_cls = ProcessPoolExecutor if mode == "process" else ThreadPoolExecutor
+        with pool_cls(max_workers=max_workers) as executor:
+            return _run_isolated(compute_match_score, jobs, executor)
+
+def rank_matches(results: Dict[str, Dict[str, float]], threshold: float = 0.60) -> List[Dict[str, any]]:
+    matches = []
+    for filename, match_result in results.items():
+        final_score = match_result["final_score"]
+        if final_score >= threshold:
+            matches.append({
+                "file": filename,
+                "score": final_score,
+                "reason": f"Your profile matches {int(final_score * 100)}% with this opportunity.",
+                "details": match_result
+            })
+
+    return sorted(matches, key=lambda x: (-x["score"], x["file"]))
+
+def matched_opportunities(matches: List[Dict[str, any]], opportunities: Dict[str, dict]) -> List[dict]:
+    matched = []
+    for match in matches:
+        if match["file"] in opportunities:
+            opp = dict(opportunities[match["file"]])
+            opp["match_score"] = match["score"]
+            matched.append(opp)
+    return matched
+
+def find_best_matches(student_json_path: str, opportunity_dir: str, threshold: float = 0.60,
+                      mode: str = "serial", max_workers: int = DEFAULT_MAX_WORKERS,
+                      opportunities: Dict[str, dict] = None, repository=None) -> List[Dict[str, any]]:
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode '{mode}'. Expected one of {EXECUTION_MODES}.")
+
     with open(student_json_path, "r") as f:
         student_json = json.load(f)
 
-    matches = []
-    for filename in os.listdir(opportunity_dir):
-        if filename.endswith(".json"):
-            with open(os.path.join(opportunity_dir, filename), "r") as f:
-                opp_json = json.load(f)
-             
-            resume_skills = normalize_keywords(extract_skills_from_resume(student_json))
-            opp_skills = normalize_keywords(extract_skills_from_opportunity(opp_json))
-
-            student_json["extracted_skills"] = resume_skills
-            opp_json["extracted_skills"] = opp_skills
-            
-            match_result = compute_match_score(student_json, opp_json)
-            final_score = match_result["final_score"]
-
-            if final_score >= threshold:
-                matches.append({
-                    "file": filename,
-                    "score": final_score,
-                    "reason": f"Your profile matches {int(final_score * 100)}% with this opportunity.",
-                    "details": match_result
-                })
-                
-    return sorted(matches, key=lambda x: x["score"], reverse=True)
+    student_json["extracted_skills"] = normalize_keywords(extract_skills_from_resume(student_json))
+
+    if opportunities is None and repository is not None:
+        opportunities = repository.load()
+    elif opportunities is None:
+        opportunities = load_opportunities(opportunity_dir, mode, max_workers)
+    results = score_opportunities(student_json, opportunities, mode, max_workers, threshold)
+
+    return rank_matches(results, threshold)
+
+def candidate_certification_scores(opp_json: dict, candidates: Dict[str, dict]) -> Dict[str, float]:
+    opp_certs = opp_json.get("mandatory_certifications", [])
+    opp_skills = opp_json.get("extracted_skills", [])
+    if not opp_certs:
+        return {
+            key: certification_similarity(candidate.get("certifications", []), [], opp_skills)
+            for key, candidate in candidates.items()
+        }
+
+    with_certs = {key: candidate["certifications"] for key, candidate in candidates.items() if candidate.get("certifications")}
+    all_certs = [cert for certs in with_certs.values() for cert in certs]
+    vectors = embed_list(opp_certs + all_certs)
+    candidate_vectors = iter(vectors[len(opp_certs):])
+    stacked = StackedEmbeddings({key: [next(candidate_vectors) for _ in certs] for key, certs in with_certs.items()})
+    sims = stacked.max_similarity(vectors[:len(opp_certs)])
+    return {key: sims.get(key, 0.0) for key in candidates}
+
+def rank_candidates(opp_json: dict, candidates: Dict[str, dict], top_k: int = 10,
+                    threshold: float = 0.0) -> List[Dict[str, any]]:
+    opp_json = dict(opp_json)
+    opp_json["extracted_skills"] = get_opportunity_skills(opp_json)
+
+    cert_scores = candidate_certification_scores(opp_json, candidates)
+    fuzzy_index = FuzzySkillIndex(opp_json["extracted_skills"])
+    fuzzy_neighbours = fuzzy_index.resolve(
+        skill for candidate in candidates.values() for skill in candidate.get("extracted_skills", [])
+    )
+
+    ranked = []
+    for key, candidate in candidates.items():
+        match_result = compute_match_score(candidate, opp_json, cert_scores.get(key), fuzzy_neighbours)
+        if match_result["final_score"] >= threshold:
+            ranked.append({
+                "file": key,
+                "name": candidate.get("name", ""),
+                "email": candidate.get("email", ""),
+                "score": match_result["final_score"],
+                "details": match_result
+            })
+
+    return heapq.nsmallest(top_k, ranked, key=lambda x: (-x["score"], x["file"]))
@@ -0,0 +1,400 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.entity_extractor import extractor_fingerprint
+from utils.skill_index import (
+    validate_opportunity,
+    is_opportunity_indexed,
+    index_opportunity,
+    is_resume_indexed,
+    index_resume
+)
+
+logger = logging.getLogger(__name__)
+
+SKILLCONNECT_DB_PATH = os.getenv("SKILLCONNECT_DB_PATH", "data/skillconnect.db")
+DEFAULT_PAGE_SIZE = 20
+JSON_IMPORT_MARKER = "json_import_completed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS opportunities (
+    key TEXT PRIMARY KEY,
+    title TEXT,
+    organization TEXT,
+    type TEXT,
+    document TEXT NOT NULL,
+    skills_hash TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+DROP INDEX IF EXISTS idx_opportunities_type;
+CREATE INDEX IF NOT EXISTS idx_opportunities_type_key ON opportunities(type, key);
+CREATE INDEX IF NOT EXISTS idx_opportunities_organization ON opportunities(organization);
+CREATE TABLE IF NOT EXISTS opportunity_skills (
+    key TEXT NOT NULL REFERENCES opportunities(key) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    skill TEXT NOT NULL,
+    PRIMARY KEY (key, position)
+);
+DROP INDEX IF EXISTS idx_opportunity_skills_skill;
+CREATE INDEX IF NOT EXISTS idx_opportunity_skills_skill_key ON opportunity_skills(skill, key);
+CREATE TABLE IF NOT EXISTS profiles (
+    key TEXT PRIMARY KEY,
+    name TEXT,
+    email TEXT,
+    document TEXT NOT NULL,
+    skills_hash TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profile_skills (
+    key TEXT NOT NULL REFERENCES profiles(key) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    skill TEXT NOT NULL,
+    PRIMARY KEY (key, position)
+);
+CREATE INDEX IF NOT EXISTS idx_profile_skills_skill ON profile_skills(skill);
+"""
+
+
+class SkillStore:
+    def __init__(self, path: str = SKILLCONNECT_DB_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        with self.connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        self.opportunities = OpportunityRepository(self)
+        self.profiles = ProfileRepository(self)
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_meta(self, name: str) -> Optional[str]:
+        row = self.connection().execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: str):
+        with self.connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+
+class Repository(ABC):
+    table = None
+    skills_table = None
+    columns: Tuple[str, ...] = ()
+    filter_columns: Tuple[str, ...] = ()
+
+    def __init__(self, store: SkillStore):
+        self.store = store
+        self._lock = threading.Lock()
+        self._revision = None
+        self._documents: Dict[str, dict] = {}
+        self._versions: Dict[str, float] = {}
+        self._delete_hooks: List[Callable[[sqlite3.Connection, str], None]] = []
+
+    @abstractmethod
+    def _index(self, doc: dict, extracted_skills: List[str] = None) -> dict:
+        pass
+
+    @abstractmethod
+    def _is_indexed(self, doc: dict) -> bool:
+        pass
+
+    def _revision_name(self) -> str:
+        return f"revision:{self.table}"
+
+    def revision(self) -> int:
+        return int(self.store.get_meta(self._revision_name()) or 0)
+
+    def _bump_revision(self, conn: sqlite3.Connection):
+        conn.execute(
+            "INSERT INTO meta (name, value) VALUES (?, '1') "
+            "ON CONFLICT(name) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+            (self._revision_name(),)
+        )
+
+    def _write(self, conn: sqlite3.Connection, key: str, doc: dict) -> float:
+        now = time.time()
+        skills = doc.get("extracted_skills", [])
+        stored = {k: v for k, v in doc.items() if k != "extracted_skills"}
+        values = [doc.get(column) for column in self.columns]
+        conn.execute(
+            f"INSERT INTO {self.table} (key, {', '.join(self.columns)}, document, skills_hash, created_at, updated_at) "
+            f"VALUES (?, {', '.join('?' * len(self.columns))}, ?, ?, ?, ?) "
+            f"ON CONFLICT(key) DO UPDATE SET "
+            f"{', '.join(f'{c} = excluded.{c}' for c in self.columns)}, "
+            f"document = excluded.document, skills_hash = excluded.skills_hash, updated_at = excluded.updated_at",
+            (key, *values, json.dumps(stored, ensure_ascii=False), doc.get("skills_hash"), now, now)
+        )
+        conn.execute(f"DELETE FROM {self.skills_table} WHERE key = ?", (key,))
+        conn.executemany(
+            f"INSERT INTO {self.skills_table} (key, position, skill) VALUES (?, ?, ?)",
+            [(key, position, skill) for position, skill in enumerate(skills)]
+        )
+        return now
+
+    def save(self, key: str, doc: dict, extracted_skills: List[str] = None) -> dict:
+        doc = self._index(doc, extracted_skills)
+        with self.store.connection() as conn:
+            self._write(conn, key, doc)
+            self._bump_revision(conn)
+        return doc
+
+    def on_delete(self, hook: Callable[[sqlite3.Connection, str], None]):
+        if hook not in self._delete_hooks:
+            self._delete_hooks.append(hook)
+
+    def delete(self, key: str):
+        with self.store.connection() as conn:
+            for hook in self._delete_hooks:
+                hook(conn, key)
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._bump_revision(conn)
+
+    def exists(self, key: str) -> bool:
+        row = self.store.connection().execute(f"SELECT 1 FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def _skills_for(self, keys: List[str]) -> Dict[str, List[str]]:
+        skills = {key: [] for key in keys}
+        if not keys:
+            return skills
+        conn = self.store.connection()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = conn.execute(
+                f"SELECT key, skill FROM {self.skills_table} WHERE key IN ({', '.join('?' * len(chunk))}) "
+                f"ORDER BY key, position",
+                chunk
+            )
+            for key, skill in rows:
+                skills[key].append(skill)
+        return skills
+
+    def _documents_from_rows(self, rows: List[tuple]) -> Dict[str, dict]:
+        skills = self._skills_for([key for key, _ in rows])
+        documents = {}
+        for key, document in rows:
+            doc = json.loads(document)
+            doc["extracted_skills"] = skills[key]
+            documents[key] = doc
+        return documents
+
+    def _where(self, filters: Dict[str, Optional[str]]) -> Tuple[str, list]:
+        clauses, params = [], []
+        for column, value in filters.items():
+            if column not in self.filter_columns:
+                raise ValueError(f"Cannot filter {self.table} by '{column}'. Expected one of {self.filter_columns}.")
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def get(self, key: str) -> Optional[dict]:
+        rows = self.store.connection().execute(
+            f"SELECT key, document FROM {self.table} WHERE key = ?", (key,)
+        ).fetchall()
+        return self._documents_from_rows(rows).get(key)
+
+    def page(self, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE, **filters) -> Dict[str, dict]:
+        where, params = self._where(filters)
+        rows = self.store.connection().execute(
+            f"SELECT key, document FROM {self.table}{where} ORDER BY key LIMIT ? OFFSET ?",
+            (*params, limit, offset)
+        ).fetchall()
+        return self._documents_from_rows(rows)
+
+    def count(self, **filters) -> int:
+        where, params = self._where(filters)
+        return self.store.connection().execute(f"SELECT COUNT(*) FROM {self.table}{where}", params).fetchone()[0]
+
+    def distinct(self, column: str) -> List[str]:
+        if column not in self.filter_columns:
+            raise ValueError(f"Unknown column '{column}'. Expected one of {self.filter_columns}.")
+        rows = self.store.connection().execute(
+            f"SELECT DISTINCT {column} FROM {self.table} WHERE {column} IS NOT NULL ORDER BY {column}"
+        )
+        return [value for value, in rows]
+
+    def load(self) -> Dict[str, dict]:
+        revision = (self.revision(), extractor_fingerprint())
+        with self._lock:
+            if revision != self._revision:
+                previous = self._documents
+                self._documents = self._reload(previous)
+                if self._revision is None or revision[1] != self._revision[1]:
+                    self._reindex_stale(self._documents, list(self._documents))
+                else:
+                    self._reindex_stale(self._documents, [
+                        key for key, doc in self._documents.items() if previous.get(key) is not doc
+                    ])
+                self._revision = revision
+            return self._documents
+
+    def _reload(self, previous: Dict[str, dict]) -> Dict[str, dict]:
+        conn = self.store.connection()
+        versions = dict(conn.execute(f"SELECT key, updated_at FROM {self.table} ORDER BY key"))
+        changed = [key for key, updated_at in versions.items()
+                   if key not in previous or self._versions.get(key) != updated_at]
+        fresh = {}
+        for start in range(0, len(changed), 500):
+            chunk = changed[start:start + 500]
+            rows = conn.execute(
+                f"SELECT key, document FROM {self.table} WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            fresh.update(self._documents_from_rows(rows))
+        documents = {}
+        for key in versions:
+            if key in fresh:
+                documents[key] = fresh[key]
+            elif key in previous:
+                documents[key] = previous[key]
+        self._versions = versions
+        return documents
+
+    def _reindex_stale(self, documents: Dict[str, dict], keys: List[str]):
+        stale = [key for key in keys if not self._is_indexed(documents[key])]
+        if not stale:
+            return
+        reindexed = []
+        for key in stale:
+            try:
+                documents[key] = self._index(dict(documents[key]))
+                reindexed.append(key)
+            except Exception as e:
+                logger.warning("Could not re-index %s %s: %s", self.table, key, e)
+        if reindexed:
+            with self.store.connection() as conn:
+                for key in reindexed:
+                    self._versions[key] = self._write(conn, key, documents[key])
+                self._bump_revision(conn)
+
+
+class OpportunityRepository(Repository):
+    table = "opportunities"
+    skills_table = "opportunity_skills"
+    columns = ("title", "organization", "type")
+    filter_columns = ("organization", "type")
+
+    def _index(self, doc: dict, extracted_skills: List[str] = None) -> dict:
+        validate_opportunity(doc)
+        if not is_opportunity_indexed(doc):
+            index_opportunity(doc)
+        return doc
+
+    def _is_indexed(self, doc: dict) -> bool:
+        return is_opportunity_indexed(doc)
+
+    def new_key(self, title: str) -> str:
+        base = title.lower().strip().replace(" ", "_").replace("/", "_") or "opportunity"
+        key, suffix = base, 2
+        while self.exists(key):
+            key = f"{base}_{suffix}"
+            suffix += 1
+        return key
+
+    def manifest(self, after: str = None, limit: int = DEFAULT_PAGE_SIZE, opportunity_type: str = None,
+                 skill: str = None) -> List[dict]:
+        clauses, params = [], []
+        if skill:
+            source = "opportunity_skills s JOIN opportunities o ON o.key = s.key"
+            clauses.append("s.skill = ?")
+            params.append(skill)
+            order_key = "s.key"
+        else:
+            source = "opportunities o"
+            order_key = "o.key"
+        if opportunity_type:
+            clauses.append("o.type = ?")
+            params.append(opportunity_type)
+        if after is not None:
+            clauses.append(f"{order_key} > ?")
+            params.append(after)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        rows = self.store.connection().execute(
+            f"SELECT DISTINCT o.key, o.title, o.organization, o.type FROM {source}{where} "
+            f"ORDER BY {order_key} LIMIT ?",
+            (*params, limit)
+        )
+        return [{"key": key, "title": title, "organization": organization, "type": opp_type}
+                for key, title, organization, opp_type in rows]
+
+    def add(self, doc: dict) -> str:
+        doc = self._index(doc)
+        with self.store.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            key = self.new_key(doc.get("title", ""))
+            self._write(conn, key, doc)
+            self._bump_revision(conn)
+        return key
+
+
+class ProfileRepository(Repository):
+    table = "profiles"
+    skills_table = "profile_skills"
+    columns = ("name", "email")
+    filter_columns = ("email",)
+
+    def _index(self, doc: dict, extracted_skills: List[str] = None) -> dict:
+        if extracted_skills is not None or not is_resume_indexed(doc):
+            index_resume(doc, extracted_skills)
+        return doc
+
+    def _is_indexed(self, doc: dict) -> bool:
+        return is_resume_indexed(doc)
+
+
+def _import_directory(repository: Repository, directory: str) -> int:
+    if not os.path.isdir(directory):
+        return 0
+    imported = 0
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".json"):
+            continue
+        key = filename[:-len(".json")]
+        if repository.exists(key):
+            continue
+        try:
+            with open(os.path.join(directory, filename), "r") as f:
+                repository.save(key, json.load(f))
+            imported += 1
+        except Exception as e:
+            logger.warning("Skipping %s during import: %s", filename, e)
+    return imported
+
+
+def import_json_tree(store: SkillStore, root: str = "data/json", force: bool = False) -> Dict[str, int]:
+    if store.get_meta(JSON_IMPORT_MARKER) and not force:
+        return {"opportunities": 0, "profiles": 0}
+    counts = {
+        "opportunities": _import_directory(store.opportunities, os.path.join(root, "opportunities")),
+        "profiles": _import_directory(store.profiles, os.path.join(root, "resumes")),
+    }
+    store.set_meta(JSON_IMPORT_MARKER, str(time.time()))
+    return counts
+
+
+if __name__ == "__main__":
+    source_root = sys.argv[1] if len(sys.argv) > 1 else "data/json"
+    db_path = sys.argv[2] if len(sys.argv) > 2 else SKILLCONNECT_DB_PATH
+    print(json.dumps(import_json_tree(SkillStore(db_path), source_root, force=True)))
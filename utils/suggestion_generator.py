@@ -1,7 +1,29 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
 from langchain_community.llms import Ollama as OllamaLLM
 from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import Runnable
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Iterator, Optional, Tuple
+
+from utils import resources, tracing
+
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2")
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+SUGGESTION_TOP_K = int(os.getenv("SUGGESTION_TOP_K", "3"))
+SUGGESTION_MAX_CONCURRENCY = int(os.getenv("SUGGESTION_MAX_CONCURRENCY", "3"))
+SUGGESTION_CACHE_SIZE = int(os.getenv("SUGGESTION_CACHE_SIZE", "512"))
+NO_MATCHES_MESSAGE = (
+    "⚠️ No strong matches found to generate suggestions. "
+    "Try enhancing your resume or updating your skills and certifications."
+)
+
+_suggestion_cache = OrderedDict()
+_suggestion_cache_lock = threading.Lock()
 
 
 def build_concise_prompt():
@@ -15,13 +37,6 @@ def build_concise_prompt():
 You are an AI Career Advisor. Your goal is to help students improve their job prospects with encouraging and actionable advice.
 Task: Analyze student's resume, a job/project opportunity, a match score (%) and why the given match score was assigned.
 
- OPPORTUNITY REQUIREMENTS:
-- Title: {opp_title}
-- Organization: {opp_org}
-- Role: {opp_role}
-- Required Skills: {opp_skills}
-- Required Certifications: {opp_certs}
-
  STUDENT PROFILE:
 - Objective: {stu_objective}
 - Skills: {stu_skills}
@@ -30,6 +45,13 @@ Task: Analyze student's resume, a job/project opportunity, a match score (%) and
 - Experience: {stu_experience}
 - Education: {stu_education}
 
+ OPPORTUNITY REQUIREMENTS:
+- Title: {opp_title}
+- Organization: {opp_org}
+- Role: {opp_role}
+- Required Skills: {opp_skills}
+- Required Certifications: {opp_certs}
+
 MATCH SCORE: {score}%
 
 Instructions:
@@ -47,45 +69,125 @@ Key Rules:
     )
 
 
+def _load_suggestion_chain() -> Runnable:
+    return build_concise_prompt() | OllamaLLM(model=OLLAMA_MODEL, keep_alive=OLLAMA_KEEP_ALIVE)
+
+
+resources.register("suggestion_chain", _load_suggestion_chain)
+
+
+def suggestion_cache_key(inputs: Dict) -> str:
+    payload = json.dumps({"model": OLLAMA_MODEL, "inputs": inputs}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cached_suggestion(key: str) -> Optional[str]:
+    with _suggestion_cache_lock:
+        if key in _suggestion_cache:
+            _suggestion_cache.move_to_end(key)
+            tracing.increment("cache_lookups", cache="suggestion", result="hit")
+            return _suggestion_cache[key]
+    tracing.increment("cache_lookups", cache="suggestion", result="miss")
+    return None
+
+
+def _store_suggestion(key: str, text: str):
+    with _suggestion_cache_lock:
+        _suggestion_cache[key] = text
+        _suggestion_cache.move_to_end(key)
+        while len(_suggestion_cache) > SUGGESTION_CACHE_SIZE:
+            _suggestion_cache.popitem(last=False)
+
+
+def select_suggestion_target(top_opportunities: List[Dict]) -> Tuple[Dict, float]:
+    all_low_scores = all(opp.get("match_score", 0) < 0.7 for opp in top_opportunities)
+
+    if all_low_scores:
+        combined_opp = {
+            "title": "Top 3 Opportunities (Generalized)",
+            "organization": "Multiple",
+            "role": "Various",
+            "required_skills": list({
+                skill for opp in top_opportunities for skill in opp.get("required_skills", [])
+            }),
+            "mandatory_certifications": list({
+                cert for opp in top_opportunities for cert in opp.get("mandatory_certifications", [])
+            })
+        }
+        score = max((opp.get("match_score", 0) for opp in top_opportunities), default=0.0)
+        return combined_opp, score
+
+    best = max(top_opportunities, key=lambda o: o.get("match_score", 0))
+    return best, best.get("match_score", 0)
+
+
 def generate_suggestions(student_dict: Dict, top_opportunities: List[Dict]):
     try:
         if not top_opportunities:
-            return (
-                "⚠️ No strong matches found to generate suggestions. "
-                "Try enhancing your resume or updating your skills and certifications."
-            )
-
-        llm = OllamaLLM(model="llama3.2")
-        prompt = build_concise_prompt()
-        chain: Runnable = prompt | llm
-
-        all_low_scores = all(opp.get("match_score", 0) < 0.7 for opp in top_opportunities)
-
-        if all_low_scores:
-            combined_opp = {
-                "title": "Top 3 Opportunities (Generalized)",
-                "organization": "Multiple",
-                "role": "Various",
-                "required_skills": list({
-                    skill for opp in top_opportunities for skill in opp.get("required_skills", [])
-                }),
-                "mandatory_certifications": list({
-                    cert for opp in top_opportunities for cert in opp.get("mandatory_certifications", [])
-                })
-            }
-            score = max((opp.get("match_score", 0) for opp in top_opportunities), default=0.0)
-            return run_chain(chain, student_dict, combined_opp, score)
+            return NO_MATCHES_MESSAGE
 
-        else:
-            best = max(top_opportunities, key=lambda o: o.get("match_score", 0))
-            return run_chain(chain, student_dict, best, best.get("match_score", 0))
+        chain: Runnable = resources.get("suggestion_chain")
+        opportunity, score = select_suggestion_target(top_opportunities)
+        return run_chain(chain, student_dict, opportunity, score)
 
     except Exception as e:
         return f"⚠️ Error generating suggestions: {e}"
 
 
-def run_chain(chain: Runnable, student_dict: Dict, opportunity_dict: Dict, match_score: float):
-    inputs = {
+def generate_match_suggestions(student_dict: Dict, top_opportunities: List[Dict], top_k: int = SUGGESTION_TOP_K,
+                               max_concurrency: int = SUGGESTION_MAX_CONCURRENCY) -> List[Tuple[Dict, str]]:
+    targets = sorted(top_opportunities, key=lambda o: -o.get("match_score", 0))[:top_k]
+
+    def suggest(opportunity: Dict) -> str:
+        try:
+            chain: Runnable = resources.get("suggestion_chain")
+            return run_chain(chain, student_dict, opportunity, opportunity.get("match_score", 0))
+        except Exception as e:
+            return f"⚠️ Error generating suggestions: {e}"
+
+    with tracing.span("suggestions.per_match", opportunities=len(targets), max_concurrency=max_concurrency):
+        if max_concurrency <= 1 or len(targets) <= 1:
+            texts = [suggest(opportunity) for opportunity in targets]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(targets))) as executor:
+                texts = list(executor.map(tracing.bind(suggest), targets))
+    return list(zip(targets, texts))
+
+
+def stream_suggestions(student_dict: Dict, top_opportunities: List[Dict]) -> Iterator[str]:
+    try:
+        if not top_opportunities:
+            yield NO_MATCHES_MESSAGE
+            return
+
+        chain: Runnable = resources.get("suggestion_chain")
+        opportunity, score = select_suggestion_target(top_opportunities)
+        inputs = build_chain_inputs(student_dict, opportunity, score)
+        key = suggestion_cache_key(inputs)
+        cached = _cached_suggestion(key)
+        if cached is not None:
+            yield cached
+            return
+
+        tracing.increment("remote_calls", service="ollama")
+        started = time.perf_counter()
+        first_chunk = None
+        chunks = []
+        for chunk in chain.stream(inputs):
+            if first_chunk is None:
+                first_chunk = time.perf_counter() - started
+            chunks.append(chunk)
+            yield chunk
+        tracing.record("ollama.stream", time.perf_counter() - started,
+                       first_chunk_ms=round((first_chunk or 0.0) * 1000), chunks=len(chunks))
+        _store_suggestion(key, "".join(chunks))
+
+    except Exception as e:
+        yield f"⚠️ Error generating suggestions: {e}"
+
+
+def build_chain_inputs(student_dict: Dict, opportunity_dict: Dict, match_score: float) -> Dict:
+    return {
         "opp_title": opportunity_dict.get("title", "N/A"),
         "opp_org": opportunity_dict.get("organization", "N/A"),
         "opp_role": opportunity_dict.get("role", "N/A"),
@@ -100,4 +202,16 @@ def run_chain(chain: Runnable, student_dict: Dict, opportunity_dict: Dict, match
         "score": round(match_score * 100)
     }
 
-    return chain.invoke(inputs)
+
+def run_chain(chain: Runnable, student_dict: Dict, opportunity_dict: Dict, match_score: float):
+    inputs = build_chain_inputs(student_dict, opportunity_dict, match_score)
+    key = suggestion_cache_key(inputs)
+    cached = _cached_suggestion(key)
+    if cached is not None:
+        return cached
+
+    tracing.increment("remote_calls", service="ollama")
+    with tracing.span("ollama.invoke"):
+        response = chain.invoke(inputs)
+    _store_suggestion(key, response)
+    return response
@@ -0,0 +1,263 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "1") == "1"
+TRACE_EXPORT = os.getenv("TRACE_EXPORT", "")
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "data/metrics/skillconnect.prom")
+TRACE_EXPORTERS = ("", "prometheus", "json")
+METRIC_PREFIX = "skillconnect"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+if TRACE_EXPORT not in TRACE_EXPORTERS:
+    raise ValueError(f"Unknown TRACE_EXPORT '{TRACE_EXPORT}'. Expected one of {TRACE_EXPORTERS}.")
+
+
+class Span:
+    def __init__(self, name: str, attributes: Dict[str, Any] = None):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.children: List["Span"] = []
+        self.started_at = time.time()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+            "children": [child.to_dict() for child in list(self.children)],
+        }
+
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+_metrics_lock = threading.Lock()
+_counters: Dict[Tuple[str, tuple], float] = {}
+_histograms: Dict[str, List[float]] = {}
+_last_trace: Optional[Span] = None
+
+
+def _labels_key(labels: Dict[str, Any]) -> tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def increment(name: str, value: float = 1, **labels):
+    if not TRACING_ENABLED:
+        return
+    key = (name, _labels_key(labels))
+    with _metrics_lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, seconds: float):
+    with _metrics_lock:
+        histogram = _histograms.setdefault(name, [0] * (len(LATENCY_BUCKETS) + 2))
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                histogram[i] += 1
+        histogram[-2] += 1
+        histogram[-1] += seconds
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def annotate(**attributes):
+    current = _current_span.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+def _finish(span: Span, parent: Optional[Span], started: float):
+    span.duration = time.perf_counter() - started
+    observe(span.name, span.duration)
+    if parent is not None:
+        parent.children.append(span)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    if not TRACING_ENABLED:
+        yield None
+        return
+    parent = _current_span.get()
+    current = Span(name, attributes)
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        _finish(current, parent, started)
+
+
+def record(name: str, seconds: float, **attributes):
+    if not TRACING_ENABLED:
+        return
+    finished = Span(name, attributes)
+    finished.started_at = time.time() - seconds
+    finished.duration = seconds
+    observe(name, seconds)
+    parent = _current_span.get()
+    if parent is not None:
+        parent.children.append(finished)
+
+
+def traced(name: str = None):
+    def decorator(fn: Callable):
+        span_name = name or f"{fn.__module__.split('.')[-1]}.{fn.__name__}"
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bind(fn: Callable) -> Callable:
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def bound(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return bound
+
+
+@contextmanager
+def trace(name: str, **attributes):
+    global _last_trace
+    token = _current_span.set(None)
+    try:
+        with span(name, **attributes) as root:
+            yield root
+    finally:
+        _current_span.reset(token)
+        if root is not None:
+            _last_trace = root
+            export(root)
+
+
+def last_trace() -> Optional[Span]:
+    return _last_trace
+
+
+def snapshot() -> dict:
+    with _metrics_lock:
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(_counters.items())
+        ]
+        histograms = {
+            name: {"count": values[-2], "sum": values[-1],
+                   "buckets": dict(zip(map(str, LATENCY_BUCKETS), values[:-2]))}
+            for name, values in sorted(_histograms.items())
+        }
+    return {"counters": counters, "spans": histograms}
+
+
+def reset_metrics():
+    global _last_trace
+    with _metrics_lock:
+        _counters.clear()
+        _histograms.clear()
+    _last_trace = None
+
+
+def _metric_name(name: str) -> str:
+    return f"{METRIC_PREFIX}_" + "".join(ch if ch.isalnum() else "_" for ch in name)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        f'{key}="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for key, value in sorted(labels.items())
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def to_prometheus() -> str:
+    metrics = snapshot()
+    lines = []
+    seen = set()
+    for counter in metrics["counters"]:
+        metric = _metric_name(counter["name"]) + "_total"
+        if metric not in seen:
+            lines.append(f"# TYPE {metric} counter")
+            seen.add(metric)
+        lines.append(f"{metric}{_format_labels(counter['labels'])} {counter['value']}")
+
+    metric = _metric_name("stage_seconds")
+    if metrics["spans"]:
+        lines.append(f"# TYPE {metric} histogram")
+    for stage, histogram in metrics["spans"].items():
+        for bound, count in histogram["buckets"].items():
+            lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+        lines.append(f'{metric}_bucket{{stage="{stage}",le="+Inf"}} {histogram["count"]}')
+        lines.append(f'{metric}_sum{{stage="{stage}"}} {histogram["sum"]}')
+        lines.append(f'{metric}_count{{stage="{stage}"}} {histogram["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_textfile(path: str = TRACE_EXPORT_PATH):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(to_prometheus())
+    os.replace(tmp_path, path)
+
+
+def append_json_log(root: Span, path: str = TRACE_EXPORT_PATH):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(root.to_dict()) + "\n")
+
+
+def export(root: Span):
+    try:
+        if TRACE_EXPORT == "prometheus":
+            write_prometheus_textfile(TRACE_EXPORT_PATH)
+        elif TRACE_EXPORT == "json":
+            append_json_log(root, TRACE_EXPORT_PATH)
+    except Exception as e:
+        logger.warning("Trace export failed: %s", e)
+
+
+def format_tree(root: dict, indent: int = 0) -> List[str]:
+    duration = root["duration"] or 0.0
+    attributes = ", ".join(f"{key}={value}" for key, value in root["attributes"].items())
+    line = f"{'  ' * indent}{root['name']} — {duration * 1000:.1f} ms"
+    if attributes:
+        line += f" ({attributes})"
+    if root["error"]:
+        line += f" ✗ {root['error']}"
+    lines = [line]
+    for child in sorted(root["children"], key=lambda c: c["started_at"]):
+        lines.extend(format_tree(child, indent + 1))
+    return lines